@@ -0,0 +1,47 @@
+"""add http client settings
+
+Revision ID: 0a9e0f1a2b3c
+Revises: f28d9e0f1a2b
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a9e0f1a2b3c'
+down_revision: Union[str, Sequence[str], None] = 'f28d9e0f1a2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'http_max_connections', 'value': '100'},
+    {'key': 'http_max_keepalive_connections', 'value': '20'},
+    {'key': 'http_keepalive_expiry', 'value': '30'},
+    {'key': 'http_http2', 'value': 'true'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
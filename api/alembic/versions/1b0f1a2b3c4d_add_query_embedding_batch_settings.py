@@ -0,0 +1,45 @@
+"""add query embedding batch settings
+
+Revision ID: 1b0f1a2b3c4d
+Revises: 0a9e0f1a2b3c
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b0f1a2b3c4d'
+down_revision: Union[str, Sequence[str], None] = '0a9e0f1a2b3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'query_embedding_batch_window_ms', 'value': '5'},
+    {'key': 'query_embedding_batch_max_items', 'value': '32'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,55 @@
+"""create collection state table
+
+Revision ID: 2c1a2b3c4d5e
+Revises: 1b0f1a2b3c4d
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c1a2b3c4d5e'
+down_revision: Union[str, Sequence[str], None] = '1b0f1a2b3c4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'search_cache_enabled', 'value': 'true'},
+    {'key': 'search_cache_max_items', 'value': '1000'},
+    {'key': 'search_cache_ttl_seconds', 'value': '300'},
+    {'key': 'search_cache_generation_check_ms', 'value': '1000'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rfy_collection_state',
+        sa.Column('collection_name', sa.String(255), primary_key=True),
+        sa.Column('generation', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
+    op.drop_table('rfy_collection_state')
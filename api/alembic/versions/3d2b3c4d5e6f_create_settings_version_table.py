@@ -0,0 +1,53 @@
+"""create settings version table
+
+Revision ID: 3d2b3c4d5e6f
+Revises: 2c1a2b3c4d5e
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d2b3c4d5e6f'
+down_revision: Union[str, Sequence[str], None] = '2c1a2b3c4d5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'settings_refresh_interval_ms', 'value': '2000'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_version_table = op.create_table(
+        'settings_version',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+    op.bulk_insert(settings_version_table, [{'id': 1, 'version': 1}])
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
+    op.drop_table('settings_version')
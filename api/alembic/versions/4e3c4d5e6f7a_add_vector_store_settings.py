@@ -0,0 +1,44 @@
+"""add vector store settings
+
+Revision ID: 4e3c4d5e6f7a
+Revises: 3d2b3c4d5e6f
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e3c4d5e6f7a'
+down_revision: Union[str, Sequence[str], None] = '3d2b3c4d5e6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'vector_store_backend', 'value': 'qdrant'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
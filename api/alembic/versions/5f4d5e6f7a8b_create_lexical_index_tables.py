@@ -0,0 +1,72 @@
+"""create lexical index tables
+
+Revision ID: 5f4d5e6f7a8b
+Revises: 4e3c4d5e6f7a
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f4d5e6f7a8b'
+down_revision: Union[str, Sequence[str], None] = '4e3c4d5e6f7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'lexical_index_enabled', 'value': 'true'},
+    {'key': 'hybrid_rrf_k', 'value': '60'},
+    {'key': 'hybrid_candidate_limit', 'value': '20'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rfy_lexical_document',
+        sa.Column('content_id', sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column('collection_name', sa.String(255), nullable=True),
+        sa.Column('length', sa.Integer(), nullable=False),
+    )
+    op.create_index(op.f('ix_rfy_lexical_document_collection_name'), 'rfy_lexical_document', ['collection_name'], unique=False)
+    op.create_table(
+        'rfy_lexical_posting',
+        sa.Column('content_id', sa.Integer(), primary_key=True, autoincrement=False),
+        # Binary collation: terms are already case- and accent-folded, and the
+        # default collation would treat distinct terms as duplicate keys
+        sa.Column('term', sa.String(64, collation='utf8mb4_bin'), primary_key=True),
+        sa.Column('collection_name', sa.String(255), nullable=True),
+        sa.Column('tf', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_rfy_lexical_posting_collection_term', 'rfy_lexical_posting', ['collection_name', 'term'], unique=False)
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+    # Send already-synced rows through the next sync once; their hashes still
+    # match, so they are indexed without being re-embedded
+    op.execute("UPDATE rfy_content_buffer SET is_dirty = 1 WHERE synced_hash IS NOT NULL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
+    op.drop_index('ix_rfy_lexical_posting_collection_term', table_name='rfy_lexical_posting')
+    op.drop_table('rfy_lexical_posting')
+    op.drop_index(op.f('ix_rfy_lexical_document_collection_name'), table_name='rfy_lexical_document')
+    op.drop_table('rfy_lexical_document')
@@ -0,0 +1,52 @@
+"""add content chunking
+
+Revision ID: 6a5e6f7a8b9c
+Revises: 5f4d5e6f7a8b
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a5e6f7a8b9c'
+down_revision: Union[str, Sequence[str], None] = '5f4d5e6f7a8b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'chunk_mode', 'value': 'none'},
+    {'key': 'chunk_size', 'value': '256'},
+    {'key': 'chunk_overlap', 'value': '32'},
+    {'key': 'chunk_search_overfetch', 'value': '4'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rfy_content_buffer', sa.Column('chunk_count', sa.Integer(), nullable=True))
+    op.add_column('rfy_content_tombstone', sa.Column('chunk_count', sa.Integer(), nullable=True))
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
+    op.drop_column('rfy_content_tombstone', 'chunk_count')
+    op.drop_column('rfy_content_buffer', 'chunk_count')
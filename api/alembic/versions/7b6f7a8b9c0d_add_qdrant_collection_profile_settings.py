@@ -0,0 +1,49 @@
+"""add qdrant collection profile settings
+
+Revision ID: 7b6f7a8b9c0d
+Revises: 6a5e6f7a8b9c
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b6f7a8b9c0d'
+down_revision: Union[str, Sequence[str], None] = '6a5e6f7a8b9c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Empty oversampling / hnsw_ef fall back to the profile's and Qdrant's defaults
+SETTINGS = [
+    {'key': 'qdrant_collection_profile', 'value': 'float32'},
+    {'key': 'qdrant_hnsw_m', 'value': '16'},
+    {'key': 'qdrant_hnsw_ef_construct', 'value': '100'},
+    {'key': 'qdrant_search_oversampling', 'value': ''},
+    {'key': 'qdrant_search_hnsw_ef', 'value': ''},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,46 @@
+"""add embedding settings
+
+Revision ID: 8b1c2d3e4f5a
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1c2d3e4f5a'
+down_revision: Union[str, Sequence[str], None] = '7a8b9c0d1e2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'embedding_batch_size', 'value': '32'},
+    {'key': 'embedding_concurrency', 'value': '4'},
+    {'key': 'embedding_max_retries', 'value': '3'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,49 @@
+"""add payload projection settings
+
+Revision ID: 8c7a8b9c0d1e
+Revises: 7b6f7a8b9c0d
+Create Date: 2026-10-18 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c7a8b9c0d1e'
+down_revision: Union[str, Sequence[str], None] = '7b6f7a8b9c0d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# JSON maps of collection name (or "*" for the rest) to a list of payload
+# fields, null meaning the whole payload. Fields left out of the vector
+# payload are loaded from the content buffer by id when an endpoint asks for them.
+SETTINGS = [
+    {'key': 'payload_vector_fields', 'value': '{}'},
+    {'key': 'payload_search_fields', 'value': '{}'},
+    {'key': 'payload_chat_fields', 'value': '{"*": ["title", "url"]}'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
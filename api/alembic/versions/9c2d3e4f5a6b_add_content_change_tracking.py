@@ -0,0 +1,54 @@
+"""add content change tracking
+
+Revision ID: 9c2d3e4f5a6b
+Revises: 8b1c2d3e4f5a
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2d3e4f5a6b'
+down_revision: Union[str, Sequence[str], None] = '8b1c2d3e4f5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rfy_content_buffer', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('rfy_content_buffer', sa.Column('synced_hash', sa.String(64), nullable=True))
+    op.add_column('rfy_content_buffer', sa.Column('synced_model', sa.String(255), nullable=True))
+    # Existing rows have never been tracked, so they all start dirty
+    op.add_column('rfy_content_buffer', sa.Column('is_dirty', sa.Boolean(), nullable=False, server_default=sa.true()))
+    op.add_column('rfy_content_buffer', sa.Column('updated_at', sa.DateTime(), nullable=True, server_default=sa.func.now()))
+    op.add_column('rfy_content_buffer', sa.Column('synced_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_rfy_content_buffer_is_dirty'), 'rfy_content_buffer', ['is_dirty'], unique=False)
+    op.create_index(op.f('ix_rfy_content_buffer_synced_model'), 'rfy_content_buffer', ['synced_model'], unique=False)
+
+    op.create_table(
+        'rfy_content_tombstone',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('content_id', sa.Integer(), nullable=False),
+        sa.Column('collection_name', sa.String(255), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(op.f('ix_rfy_content_tombstone_id'), 'rfy_content_tombstone', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rfy_content_tombstone_id'), table_name='rfy_content_tombstone')
+    op.drop_table('rfy_content_tombstone')
+    op.drop_index(op.f('ix_rfy_content_buffer_synced_model'), table_name='rfy_content_buffer')
+    op.drop_index(op.f('ix_rfy_content_buffer_is_dirty'), table_name='rfy_content_buffer')
+    op.drop_column('rfy_content_buffer', 'synced_at')
+    op.drop_column('rfy_content_buffer', 'updated_at')
+    op.drop_column('rfy_content_buffer', 'is_dirty')
+    op.drop_column('rfy_content_buffer', 'synced_model')
+    op.drop_column('rfy_content_buffer', 'synced_hash')
+    op.drop_column('rfy_content_buffer', 'content_hash')
@@ -0,0 +1,47 @@
+"""add payload index settings
+
+Revision ID: 9d8b9c0d1e2f
+Revises: 8c7a8b9c0d1e
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d8b9c0d1e2f'
+down_revision: Union[str, Sequence[str], None] = '8c7a8b9c0d1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# JSON map of collection name (or "*" for the rest) to {field: schema}, schema
+# being a Qdrant payload index type such as keyword, integer, float or bool.
+# Indexes are created when a sync first touches the collection.
+SETTINGS = [
+    {'key': 'payload_index_fields', 'value': '{"*": {"source_id": "keyword"}}'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,61 @@
+"""create sync job table
+
+Revision ID: ad3e4f5a6b7c
+Revises: 9c2d3e4f5a6b
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ad3e4f5a6b7c'
+down_revision: Union[str, Sequence[str], None] = '9c2d3e4f5a6b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rfy_sync_job',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('collection_name', sa.String(255), nullable=True),
+        sa.Column('status', sa.String(32), nullable=False, server_default='queued'),
+        sa.Column('rows_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index(op.f('ix_rfy_sync_job_status'), 'rfy_sync_job', ['status'], unique=False)
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, [
+        {'key': 'sync_job_workers', 'value': '2'},
+        {'key': 'sync_job_queue_size', 'value': '16'},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_(['sync_job_workers', 'sync_job_queue_size']))
+    )
+    op.drop_index(op.f('ix_rfy_sync_job_status'), table_name='rfy_sync_job')
+    op.drop_table('rfy_sync_job')
@@ -0,0 +1,47 @@
+"""add federated search settings
+
+Revision ID: ae9c0d1e2f3a
+Revises: 9d8b9c0d1e2f
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae9c0d1e2f3a'
+down_revision: Union[str, Sequence[str], None] = '9d8b9c0d1e2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# How each collection's lexical and hybrid scores are rescaled before a
+# multi-collection search merges them: "minmax" maps every collection onto
+# 0..1, "none" keeps raw scores. Vector (cosine) scores are always merged raw.
+SETTINGS = [
+    {'key': 'federated_score_normalization', 'value': 'minmax'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
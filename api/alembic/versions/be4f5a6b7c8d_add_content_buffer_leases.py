@@ -0,0 +1,44 @@
+"""add content buffer leases
+
+Revision ID: be4f5a6b7c8d
+Revises: ad3e4f5a6b7c
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'be4f5a6b7c8d'
+down_revision: Union[str, Sequence[str], None] = 'ad3e4f5a6b7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rfy_content_buffer', sa.Column('lease_owner', sa.String(64), nullable=True))
+    op.add_column('rfy_content_buffer', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, [
+        {'key': 'sync_lease_seconds', 'value': '300'},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(settings_table.delete().where(settings_table.c.key == 'sync_lease_seconds'))
+    op.drop_column('rfy_content_buffer', 'lease_expires_at')
+    op.drop_column('rfy_content_buffer', 'lease_owner')
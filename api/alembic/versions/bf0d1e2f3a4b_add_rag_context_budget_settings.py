@@ -0,0 +1,49 @@
+"""add rag context budget settings
+
+Revision ID: bf0d1e2f3a4b
+Revises: ae9c0d1e2f3a
+Create Date: 2026-10-18 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bf0d1e2f3a4b'
+down_revision: Union[str, Sequence[str], None] = 'ae9c0d1e2f3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Chat renders each hit through the item template (fields it names must also
+# be fetched, see payload_chat_fields) and adds hits best first until the
+# prompt reaches the token budget; 0 disables the budget
+SETTINGS = [
+    {'key': 'rag_context_item_template', 'value': '- {title}: {url}'},
+    {'key': 'rag_context_token_budget', 'value': '2048'},
+    {'key': 'rag_context_max_items', 'value': '5'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
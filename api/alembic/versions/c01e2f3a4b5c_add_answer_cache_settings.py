@@ -0,0 +1,48 @@
+"""add answer cache settings
+
+Revision ID: c01e2f3a4b5c
+Revises: bf0d1e2f3a4b
+Create Date: 2026-10-18 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c01e2f3a4b5c'
+down_revision: Union[str, Sequence[str], None] = 'bf0d1e2f3a4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Opt-in: replays a stored chat answer for the same model and prompt until
+# the collections it was retrieved from are synced again
+SETTINGS = [
+    {'key': 'answer_cache_enabled', 'value': 'false'},
+    {'key': 'answer_cache_max_items', 'value': '500'},
+    {'key': 'answer_cache_ttl_seconds', 'value': '3600'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,39 @@
+"""add bulk insert settings
+
+Revision ID: cf5a6b7c8d9e
+Revises: be4f5a6b7c8d
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cf5a6b7c8d9e'
+down_revision: Union[str, Sequence[str], None] = 'be4f5a6b7c8d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, [
+        {'key': 'bulk_insert_batch_size', 'value': '1000'},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(settings_table.delete().where(settings_table.c.key == 'bulk_insert_batch_size'))
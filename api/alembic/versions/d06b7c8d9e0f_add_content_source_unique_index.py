@@ -0,0 +1,56 @@
+"""add content source unique index
+
+Revision ID: d06b7c8d9e0f
+Revises: cf5a6b7c8d9e
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd06b7c8d9e0f'
+down_revision: Union[str, Sequence[str], None] = 'cf5a6b7c8d9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATES = """
+    SELECT collection_name, source_id, MAX(id) AS keep_id
+    FROM rfy_content_buffer
+    WHERE source_id IS NOT NULL AND collection_name IS NOT NULL
+    GROUP BY collection_name, source_id
+    HAVING COUNT(*) > 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the newest row for every duplicated source item; tombstone the rest
+    # so the next sync removes their Qdrant points
+    op.execute(f"""
+        INSERT INTO rfy_content_tombstone (content_id, collection_name, deleted_at)
+        SELECT b.id, b.collection_name, NOW()
+        FROM rfy_content_buffer b
+        JOIN ({DUPLICATES}) d
+          ON b.collection_name = d.collection_name AND b.source_id = d.source_id AND b.id <> d.keep_id
+    """)
+    op.execute(f"""
+        DELETE b FROM rfy_content_buffer b
+        JOIN ({DUPLICATES}) d
+          ON b.collection_name = d.collection_name AND b.source_id = d.source_id AND b.id <> d.keep_id
+    """)
+    op.create_index(
+        'uq_rfy_content_buffer_collection_source',
+        'rfy_content_buffer',
+        ['collection_name', 'source_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_rfy_content_buffer_collection_source', table_name='rfy_content_buffer')
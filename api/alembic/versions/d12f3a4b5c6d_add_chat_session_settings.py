@@ -0,0 +1,51 @@
+"""add chat session settings
+
+Revision ID: d12f3a4b5c6d
+Revises: c01e2f3a4b5c
+Create Date: 2026-10-18 06:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd12f3a4b5c6d'
+down_revision: Union[str, Sequence[str], None] = 'c01e2f3a4b5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Sessions keep the token context Ollama returns so follow-up turns skip
+# re-processing the conversation; they are bounded by count, idle time and the
+# total context tokens held. An empty keep_alive leaves Ollama's default.
+SETTINGS = [
+    {'key': 'chat_sessions_enabled', 'value': 'true'},
+    {'key': 'chat_session_max_items', 'value': '1000'},
+    {'key': 'chat_session_ttl_seconds', 'value': '1800'},
+    {'key': 'chat_session_max_context_tokens', 'value': '2000000'},
+    {'key': 'ollama_keep_alive', 'value': ''},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -0,0 +1,30 @@
+"""add content collection index
+
+Revision ID: e17c8d9e0f1a
+Revises: d06b7c8d9e0f
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e17c8d9e0f1a'
+down_revision: Union[str, Sequence[str], None] = 'd06b7c8d9e0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # InnoDB appends the primary key to secondary indexes, so this also serves
+    # keyset pages ordered by id within a collection
+    op.create_index(op.f('ix_rfy_content_buffer_collection_name'), 'rfy_content_buffer', ['collection_name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rfy_content_buffer_collection_name'), table_name='rfy_content_buffer')
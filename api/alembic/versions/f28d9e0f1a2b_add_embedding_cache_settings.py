@@ -0,0 +1,46 @@
+"""add embedding cache settings
+
+Revision ID: f28d9e0f1a2b
+Revises: e17c8d9e0f1a
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f28d9e0f1a2b'
+down_revision: Union[str, Sequence[str], None] = 'e17c8d9e0f1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SETTINGS = [
+    {'key': 'embedding_cache_enabled', 'value': 'true'},
+    {'key': 'embedding_cache_memory_items', 'value': '2000'},
+    {'key': 'embedding_cache_disk_items', 'value': '100000'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String),
+        sa.column('value', sa.Text)
+    )
+    op.bulk_insert(settings_table, SETTINGS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    settings_table = sa.table(
+        'settings',
+        sa.column('key', sa.String)
+    )
+    op.execute(
+        settings_table.delete().where(settings_table.c.key.in_([s['key'] for s in SETTINGS]))
+    )
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from fastapi_utils.cbv import cbv
 from app.schemas.content import ContentCreateRequest, ChatRequest, SearchRequest
 from app.services.ContentService import content_service
+from app.services.SyncJobService import sync_job_service
 from app.db.session import get_db
 
 router = APIRouter()
@@ -23,28 +25,85 @@ class ContentAPI:
             payload=request.payload
         )
 
+    @router.post("/bulk")
+    async def create_content_bulk(self, request: Request, batch_size: int = Query(None, ge=1, le=10000, description="Rows per INSERT. Defaults to the bulk_insert_batch_size setting.")):
+        """Stream NDJSON or a JSON array of content items into the rfy_content_buffer table"""
+        return await content_service.add_content_bulk(self.db, request.stream(), batch_size=batch_size)
+
     @router.get("/")
-    def get_content(self, collection_name: str = Query(None, description="Optional collection name to filter by.")):
-        """Get all content from database"""
-        return content_service.get_all_content(self.db, collection_name=collection_name)
+    def get_content(
+        self,
+        response: Response,
+        collection_name: str = Query(None, description="Optional collection name to filter by."),
+        limit: int = Query(None, ge=1, description="Page size. Defaults to 100 (max 1000) for JSON; unlimited for NDJSON."),
+        after_id: int = Query(None, description="Return rows with an id greater than this cursor."),
+        format: str = Query("json", pattern="^(json|ndjson)$", description="json for one page, ndjson to stream rows.")
+    ):
+        """Get content from database, one keyset page at a time or streamed as NDJSON"""
+        if format == "ndjson":
+            return StreamingResponse(
+                content_service.stream_content(collection_name=collection_name, after_id=after_id, limit=limit),
+                media_type="application/x-ndjson"
+            )
+        page = content_service.get_content_page(
+            self.db, collection_name=collection_name, limit=min(limit or 100, 1000), after_id=after_id
+        )
+        if page["next_after_id"] is not None:
+            response.headers["X-Next-After-Id"] = str(page["next_after_id"])
+        return page["items"]
 
     @router.delete("/{content_id}")
     def delete_content(self, content_id: int):
         """Delete content from database and Qdrant"""
         return content_service.delete_content(self.db, content_id)
 
-    @router.post("/process")
+    @router.post("/process", status_code=202)
     def process_content(self, collection_name: str = Query(None, description="Optional collection name to process. If not provided, processes all collections.")):
-        """Process content from buffer and sync to Qdrant"""
-        return content_service.process_content(self.db, collection_name=collection_name)
+        """Queue a background job that syncs content from buffer to Qdrant"""
+        return sync_job_service.enqueue(self.db, collection_name=collection_name)
+
+    @router.get("/process/{job_id}")
+    def get_process_job(self, job_id: str):
+        """Get progress of a background sync job"""
+        return sync_job_service.get_job(self.db, job_id)
+
+    @router.get("/embedding-cache")
+    def get_embedding_cache_stats(self):
+        """Get embedding cache hit/miss counters"""
+        return content_service.get_embedding_cache_stats()
+
+    @router.get("/search-cache")
+    def get_search_cache_stats(self):
+        """Get search result cache hit/miss counters"""
+        return content_service.get_search_cache_stats()
+
+    @router.get("/answer-cache")
+    def get_answer_cache_stats(self):
+        """Get chat answer cache hit/miss counters"""
+        return content_service.get_answer_cache_stats()
 
     @router.post("/search")
-    def search_content(self, request: SearchRequest):
+    async def search_content(self, request: SearchRequest):
         """Search content in Qdrant"""
-        return content_service.search_content(request, self.db)
+        return await content_service.search_content(request, self.db)
 
     @router.post("/chat")
     async def chat(self, request: ChatRequest):
         """Chat with content context from Qdrant"""
         return await content_service.chat(request, self.db)
 
+    @router.get("/chat/sessions")
+    def get_chat_session_stats(self):
+        """Get chat session store counters"""
+        return content_service.get_chat_session_stats()
+
+    @router.get("/chat/sessions/{session_id}")
+    def get_chat_session(self, session_id: str):
+        """Get a chat session's context size and per-turn time-to-first-token"""
+        return content_service.get_chat_session(session_id)
+
+    @router.delete("/chat/sessions/{session_id}")
+    def delete_chat_session(self, session_id: str):
+        """Forget a chat session"""
+        return content_service.delete_chat_session(session_id)
+
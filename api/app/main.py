@@ -1,8 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1 import router as api_v1_router
+from app.services.ContentService import content_service
+from app.services.HttpClientService import http_client_service
+from app.services.SyncJobService import sync_job_service
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    content_service.warm_http_clients()
+    sync_job_service.start()
+    yield
+    sync_job_service.shutdown()
+    await http_client_service.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3001",
@@ -1,2 +1,7 @@
+from .rfy_collection_state import RfyCollectionState
 from .rfy_content_buffer import RfyContentBuffer
-from .settings import Settings 
\ No newline at end of file
+from .rfy_content_tombstone import RfyContentTombstone
+from .rfy_lexical_index import RfyLexicalDocument, RfyLexicalPosting
+from .rfy_sync_job import RfySyncJob
+from .settings import Settings
+from .settings_version import SettingsVersion
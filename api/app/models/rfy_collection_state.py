@@ -0,0 +1,9 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, func
+from app.db.base import Base
+
+class RfyCollectionState(Base):
+    """Per-collection generation, bumped whenever the collection's Qdrant points change"""
+    __tablename__ = 'rfy_collection_state'
+    collection_name = Column(String(255), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
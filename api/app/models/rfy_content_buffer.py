@@ -1,9 +1,33 @@
-from sqlalchemy import Column, Integer, String, JSON
+import hashlib
+import json
+from sqlalchemy import Column, Integer, String, JSON, Boolean, DateTime, Index, func, true
 from app.db.base import Base
 
 class RfyContentBuffer(Base):
     __tablename__ = 'rfy_content_buffer'
+    __table_args__ = (
+        # One row per source item in a collection; rows without a source_id are never merged
+        Index('uq_rfy_content_buffer_collection_source', 'collection_name', 'source_id', unique=True),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     source_id = Column(String(255), nullable=True)
-    collection_name = Column(String(255), nullable=True)
-    payload = Column(JSON, nullable=True) 
\ No newline at end of file
+    collection_name = Column(String(255), nullable=True, index=True)
+    payload = Column(JSON, nullable=True)
+    # Change tracking for incremental sync to Qdrant
+    content_hash = Column(String(64), nullable=True)
+    synced_hash = Column(String(64), nullable=True)
+    synced_model = Column(String(255), nullable=True, index=True)
+    is_dirty = Column(Boolean, nullable=False, default=True, server_default=true(), index=True)
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
+    synced_at = Column(DateTime, nullable=True)
+    # Number of vector store points the row was last synced as (NULL means one)
+    chunk_count = Column(Integer, nullable=True)
+    # Lease held by the sync worker currently embedding this row
+    lease_owner = Column(String(64), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    @staticmethod
+    def compute_hash(source_id, payload):
+        """Stable hash of the fields that feed the embedding"""
+        canonical = json.dumps([source_id, payload], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
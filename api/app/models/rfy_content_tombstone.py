@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.db.base import Base
+
+class RfyContentTombstone(Base):
+    """Buffer rows deleted from MySQL whose Qdrant points still need removing"""
+    __tablename__ = 'rfy_content_tombstone'
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    content_id = Column(Integer, nullable=False)
+    collection_name = Column(String(255), nullable=True)
+    chunk_count = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime, nullable=False, server_default=func.now())
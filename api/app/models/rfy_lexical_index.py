@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Index
+from app.db.base import Base
+
+class RfyLexicalDocument(Base):
+    """Token count of each synced buffer row, for BM25 length normalisation"""
+    __tablename__ = 'rfy_lexical_document'
+    content_id = Column(Integer, primary_key=True, autoincrement=False)
+    collection_name = Column(String(255), nullable=True, index=True)
+    length = Column(Integer, nullable=False)
+
+class RfyLexicalPosting(Base):
+    """Inverted index entry: how often a term occurs in a synced buffer row"""
+    __tablename__ = 'rfy_lexical_posting'
+    __table_args__ = (
+        Index('ix_rfy_lexical_posting_collection_term', 'collection_name', 'term'),
+    )
+    content_id = Column(Integer, primary_key=True, autoincrement=False)
+    term = Column(String(64), primary_key=True)
+    collection_name = Column(String(255), nullable=True)
+    tf = Column(Integer, nullable=False)
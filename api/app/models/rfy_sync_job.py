@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from app.db.base import Base
+
+class RfySyncJob(Base):
+    """Background sync of the content buffer to Qdrant"""
+    __tablename__ = 'rfy_sync_job'
+    id = Column(String(36), primary_key=True)
+    collection_name = Column(String(255), nullable=True)
+    status = Column(String(32), nullable=False, default="queued", index=True)
+    rows_total = Column(Integer, nullable=False, default=0)
+    rows_done = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
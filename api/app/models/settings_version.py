@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, func
+from app.db.base import Base
+
+class SettingsVersion(Base):
+    """Single-row counter bumped on every settings change so all processes can notice it"""
+    __tablename__ = 'settings_version'
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default='0')
+    updated_at = Column(DateTime, nullable=True, server_default=func.now(), onupdate=func.now())
@@ -1,20 +1,51 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal, Union
 
 class ContentCreateRequest(BaseModel):
     source_id: Optional[str] = None
     collection_name: str
     payload: Dict[str, Any]
 
+class RangeFilter(BaseModel):
+    gt: Optional[float] = None
+    gte: Optional[float] = None
+    lt: Optional[float] = None
+    lte: Optional[float] = None
+
+class SearchFilter(BaseModel):
+    # All conditions must hold; a list in `match` matches any of its values
+    source_ids: Optional[List[str]] = None
+    match: Optional[Dict[str, Union[str, int, bool, List[Union[str, int]]]]] = None
+    range: Optional[Dict[str, RangeFilter]] = None
+
+class MmrOptions(BaseModel):
+    # 1.0 ranks by relevance alone, 0.0 by diversity alone
+    lambda_mult: float = Field(0.5, ge=0.0, le=1.0)
+    # Candidates fetched with their vectors and re-ranked down to the limit
+    fetch_k: int = Field(20, ge=1, le=200)
+
 class ChatRequest(BaseModel):
     model: str
     prompt: str
     collection_name: Optional[str] = None
+    # Search several collections at once; takes precedence over collection_name
+    collection_names: Optional[List[str]] = None
+    filter: Optional[SearchFilter] = None
+    mmr: Optional[MmrOptions] = None
+    # "new" starts a conversation, whose id comes back in the X-Chat-Session-Id
+    # header; send that id to continue it. Without one, chat is stateless
+    session_id: Optional[str] = None
 
 class SearchRequest(BaseModel):
     query: str
     collection_name: Optional[str] = None
+    collection_names: Optional[List[str]] = None
     limit: Optional[int] = 5
+    # vector: embedding similarity; lexical: BM25; hybrid: both, fused by reciprocal rank
+    mode: Optional[Literal["vector", "lexical", "hybrid"]] = "vector"
+    filter: Optional[SearchFilter] = None
+    # Diversify vector hits with maximal marginal relevance
+    mmr: Optional[MmrOptions] = None
 
 
 
@@ -0,0 +1,155 @@
+import codecs
+import json
+
+
+class BulkRecordParser:
+    """Incremental parser for NDJSON or JSON-array request bodies.
+
+    Feed it raw byte chunks as they arrive; it yields (line, record, error)
+    tuples for every complete record and only keeps the unparsed tail in memory.
+    `line` is the 1-based line number for NDJSON and the element index for arrays.
+    """
+
+    # Largest single record we are willing to buffer while waiting for it to complete
+    MAX_RECORD_CHARS = 1024 * 1024
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._mode = None
+        self._line = 0
+        self._array_closed = False
+        # Where _element_end stopped in the element at the head of the buffer:
+        # (offset, depth, in_string, escaped)
+        self._scan = (0, 0, False, False)
+        self._skipping = False
+
+    def feed(self, chunk: bytes):
+        """Consume a chunk of the body and yield the records it completes"""
+        self._buffer += self._decoder.decode(chunk)
+        yield from self._drain(final=False)
+
+    def close(self):
+        """Signal end of body and yield whatever records remain"""
+        self._buffer += self._decoder.decode(b"", final=True)
+        yield from self._drain(final=True)
+
+    def _drain(self, final: bool):
+        if self._mode is None:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return
+            if stripped[0] == "[":
+                self._mode = "array"
+                self._buffer = stripped[1:]
+            else:
+                self._mode = "ndjson"
+        if self._mode == "ndjson":
+            yield from self._drain_ndjson(final)
+        else:
+            yield from self._drain_array(final)
+
+    def _drain_ndjson(self, final: bool):
+        lines = self._buffer.split("\n")
+        self._buffer = "" if final else lines.pop()
+        for line in lines:
+            self._line += 1
+            if not line.strip():
+                continue
+            try:
+                yield self._line, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield self._line, None, f"Invalid JSON: {e}"
+        if len(self._buffer) > self.MAX_RECORD_CHARS:
+            self._line += 1
+            self._buffer = ""
+            yield self._line, None, "Record too large"
+
+    def _element_end(self, buffer: str, pos: int):
+        """Find where the element starting at `pos` ends: the next ',' or ']' outside strings and nesting.
+
+        Only used once an element fails to decode, to step over it to the next
+        one; the scan resumes from self._scan so a growing element is not rescanned.
+        """
+        offset, depth, in_string, escaped = self._scan
+        for i in range(pos + offset, len(buffer)):
+            char = buffer[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                if depth == 0:
+                    self._scan = (0, 0, False, False)
+                    return i
+                depth -= 1
+            elif char == "," and depth == 0:
+                self._scan = (0, 0, False, False)
+                return i
+        self._scan = (len(buffer) - pos, depth, in_string, escaped)
+        return None
+
+    def _drain_array(self, final: bool):
+        buffer = self._buffer
+        pos = 0
+        if self._skipping:
+            # Still inside an oversized element that was already reported
+            end = self._element_end(buffer, 0)
+            if end is None:
+                self._buffer = ""
+                self._scan = (0,) + self._scan[1:]
+                if final:
+                    self._array_closed = True
+                return
+            self._skipping = False
+            pos = end
+        while True:
+            # Skip whitespace and the separators between elements
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._array_closed = True
+                pos = len(buffer)
+                break
+            try:
+                record, end = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # Either the element is incomplete or it is broken; a complete
+                # element is followed by a separator, so look for one and skip past it
+                end = self._element_end(buffer, pos)
+                if end is not None:
+                    self._line += 1
+                    yield self._line, None, f"Invalid JSON: {e}"
+                    pos = end
+                    continue
+                if final:
+                    self._line += 1
+                    yield self._line, None, f"Invalid JSON: {e}"
+                    self._array_closed = True
+                    pos = len(buffer)
+                elif len(buffer) - pos > self.MAX_RECORD_CHARS:
+                    self._line += 1
+                    yield self._line, None, "Record too large"
+                    # Drop what we have but keep scanning for the element's end
+                    self._skipping = True
+                    self._scan = (0,) + self._scan[1:]
+                    pos = len(buffer)
+                break
+            self._scan = (0, 0, False, False)
+            self._line += 1
+            pos = end
+            yield self._line, record, None
+        self._buffer = buffer[pos:]
+        if final and not self._array_closed and self._line > 0:
+            self._line += 1
+            yield self._line, None, "Unterminated JSON array"
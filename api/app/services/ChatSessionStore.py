@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+
+
+class ChatSession:
+    """One conversation: Ollama's token context after the last turn, plus per-turn timings"""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.created_at = time.time()
+        self.expires_at = 0.0
+        # Token ids as 32-bit ints; a Python list would take 7x the memory
+        self.context = array("i")
+        self.turns = []
+
+    def describe(self):
+        return {
+            "session_id": self.id,
+            "created_at": self.created_at,
+            "context_tokens": len(self.context),
+            "turns": list(self.turns),
+        }
+
+
+class ChatSessionStore:
+    """In-process chat sessions bounded by count (LRU), idle TTL and total context tokens.
+
+    Sessions live in the API process that created them; deployments with several
+    API workers need sticky routing for follow-up turns to find their session.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl: float = 1800.0, max_context_tokens: int = 2000000):
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._max_sessions = max_sessions
+        self._ttl = ttl
+        self._max_context_tokens = max_context_tokens
+        self._context_tokens = 0
+        self._counters = {"created": 0, "resumed": 0, "evictions": 0, "expirations": 0}
+
+    def configure(self, max_sessions: int = 1000, ttl: float = 1800.0, max_context_tokens: int = 2000000):
+        with self._lock:
+            self._max_sessions = max(0, max_sessions)
+            self._ttl = ttl
+            self._max_context_tokens = max(0, max_context_tokens)
+            self._evict()
+
+    def get_or_create(self, session_id: str = None):
+        """Return the live session with `session_id`, or a new one if it is unknown or expired"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id) if session_id else None
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                self._counters["resumed"] += 1
+            else:
+                session = ChatSession(uuid.uuid4().hex)
+                self._sessions[session.id] = session
+                self._counters["created"] += 1
+            session.expires_at = now + self._ttl
+            self._evict()
+            return session
+
+    def get(self, session_id: str):
+        with self._lock:
+            self._expire(time.monotonic())
+            return self._sessions.get(session_id)
+
+    def save_turn(self, session: ChatSession, context, turn: dict):
+        """Store the context Ollama returned after a turn, and the turn's timings"""
+        with self._lock:
+            if self._sessions.get(session.id) is not session:
+                # Evicted while the answer was streaming
+                return
+            self._context_tokens -= len(session.context)
+            session.context = array("i", context or [])
+            self._context_tokens += len(session.context)
+            session.turns.append(turn)
+            session.expires_at = time.monotonic() + self._ttl
+            self._sessions.move_to_end(session.id)
+            self._evict()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            return self._remove(session_id) is not None
+
+    def _remove(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._context_tokens -= len(session.context)
+        return session
+
+    def _expire(self, now: float):
+        """Drop sessions idle past their TTL, so their context is freed without waiting for eviction.
+
+        Every access moves a session to the end and pushes its expiry back by
+        the TTL, so the expired ones are at the front.
+        """
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.expires_at >= now:
+                break
+            self._remove(session_id)
+            self._counters["expirations"] += 1
+
+    def _evict(self):
+        while self._sessions and (
+            len(self._sessions) > self._max_sessions or self._context_tokens > self._max_context_tokens
+        ):
+            _, session = self._sessions.popitem(last=False)
+            self._context_tokens -= len(session.context)
+            self._counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                **self._counters,
+                "sessions": len(self._sessions),
+                "capacity": self._max_sessions,
+                "context_tokens": self._context_tokens,
+                "max_context_tokens": self._max_context_tokens,
+                "ttl_sec": self._ttl,
+            }
+
+
+# Create a global instance of the store
+chat_session_store = ChatSessionStore()
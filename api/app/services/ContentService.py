@@ -1,43 +1,188 @@
 import os
+import asyncio
+import hashlib
 import json
+import socket
+import threading
+import time
+import uuid
 import httpx
 from fastapi import HTTPException
+from functools import lru_cache
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from sqlalchemy import update, bindparam, or_, func, select, true
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import PointStruct, VectorParams, Distance
+from app.db.session import SessionLocal
+from app.models.rfy_collection_state import RfyCollectionState
 from app.models.rfy_content_buffer import RfyContentBuffer
+from app.models.rfy_content_tombstone import RfyContentTombstone
 from app.models.settings import Settings
-from app.schemas.content import ChatRequest, SearchRequest
+from app.models.settings_version import SettingsVersion
+from app.schemas.content import ChatRequest, SearchRequest, ContentCreateRequest
+from app.services.BulkRecordParser import BulkRecordParser
+from app.services.ChatSessionStore import chat_session_store
+from app.services.ContextBuilder import context_builder
+from app.services.EmbeddingService import embedding_service, EmbeddingStats
+from app.services.EmbeddingCache import embedding_cache, normalize_text
+from app.services.HttpClientService import http_client_service
+from app.services.LexicalIndexService import lexical_index_service
+from app.services.MmrReranker import mmr_reranker
+from app.services.NumpyVectorStore import NumpyVectorStore
+from app.services.QdrantVectorStore import QdrantVectorStore
+from app.services.TextChunker import text_chunker
+from app.services.VectorStore import CollectionNotFound
+from app.services.TtlLruCache import TtlLruCache
+
+
+# Namespace for the point ids of a row's second and later chunks
+CHUNK_ID_NAMESPACE = uuid.UUID("5f0b8c9e-3d1a-4e7b-9c2f-6a8d0e1b2c3d")
+
+DEFAULT_PAYLOAD_INDEX_FIELDS = '{"*": {"source_id": "keyword"}}'
+
+# Kept in every vector payload whatever the projection, for filtering and chunk collapsing
+RESERVED_PAYLOAD_FIELDS = ("source_id", "collection_name", "parent_id", "chunk_index")
+
+
+@lru_cache(maxsize=32)
+def _parse_collection_map(raw: str):
+    """Parse a {"collection" | "*": value} JSON setting; callers must not mutate the result"""
+    try:
+        collection_map = json.loads(raw) if raw else {}
+        if not isinstance(collection_map, dict):
+            raise ValueError("expected a JSON object")
+        return collection_map
+    except ValueError as e:
+        print(f"Warning: Ignoring malformed payload setting {raw!r}: {e}")
+        return {}
 
 
 class ContentService:
     def __init__(self):
-        self._settings_cache = {}
-        self._qdrant_client = None
+        # Immutable snapshot of the settings table, replaced wholesale on reload
+        self._settings = None
+        self._settings_version = None
+        self._settings_checked_at = 0.0
+        self._settings_lock = threading.Lock()
+        self._vector_store = None
+        self._search_cache = TtlLruCache()
+        self._answer_cache = TtlLruCache()
+        self._generations = {}
+        self._collections = {}
     
     def _get_setting(self, db: Session, key: str, default: str = None):
-        """Get a setting from database with caching"""
-        if key in self._settings_cache:
-            return self._settings_cache[key]
-        
-        setting = db.query(Settings).filter(Settings.key == key).first()
-        if setting:
-            value = setting.value
-        else:
-            value = default
-        
-        self._settings_cache[key] = value
-        return value
+        """Get a setting from the cached settings snapshot"""
+        settings = self._settings
+        if settings is None:
+            settings = self._load_settings(db)
+        return settings.get(key, default)
     
+    def _read_settings_version(self, db: Session):
+        return db.query(SettingsVersion.version).filter(SettingsVersion.id == 1).scalar() or 0
+
+    def _load_settings(self, db: Session):
+        """Load every setting into a new snapshot with a single query"""
+        with self._settings_lock:
+            # Read the version first: a change landing in between only causes
+            # one extra reload on the next check
+            version = self._read_settings_version(db)
+            settings = MappingProxyType({setting.key: setting.value for setting in db.query(Settings).all()})
+            if self._settings is not None and version != self._settings_version:
+                self._reset_settings_dependents()
+            self._settings = settings
+            self._settings_version = version
+            self._settings_checked_at = time.monotonic()
+            return settings
+
+    def _settings_stale(self):
+        if self._settings is None:
+            return True
+        interval = float(self._settings.get("settings_refresh_interval_ms", "2000")) / 1000.0
+        return time.monotonic() - self._settings_checked_at >= interval
+
+    def _refresh_settings(self, db: Session):
+        """Reload settings if another process changed them since the last check.
+
+        Costs one primary-key lookup at most every settings_refresh_interval_ms,
+        which bounds how long a process can run on settings changed elsewhere.
+        """
+        if not self._settings_stale():
+            return
+        if self._settings is not None and self._read_settings_version(db) == self._settings_version:
+            self._settings_checked_at = time.monotonic()
+            return
+        self._load_settings(db)
+
+    async def _ensure_settings_loaded(self, db: Session):
+        """Refresh the settings snapshot off the event loop so async paths never block on MySQL"""
+        if self._settings_stale():
+            await run_in_threadpool(self._refresh_settings, db)
+
+    def _bump_settings_version(self, db: Session):
+        """Record a settings change for every process; committed with the change itself"""
+        db.query(SettingsVersion).filter(SettingsVersion.id == 1).update(
+            {"version": SettingsVersion.version + 1}, synchronize_session=False
+        )
+
+    def _reset_settings_dependents(self):
+        """Drop clients and caches built from the previous settings"""
+        self._vector_store = None
+        # Results depend on the embedding model and vector store the settings point at
+        self._search_cache.clear()
+        self._answer_cache.clear()
+        self._collections.clear()
+        http_client_service.reset()
+
     def _invalidate_settings_cache(self):
         """Invalidate the settings cache"""
-        self._settings_cache.clear()
-        self._qdrant_client = None
+        self._settings = None
+        self._settings_version = None
+        self._reset_settings_dependents()
+
+    def _configure_http_clients(self, db: Session):
+        """Apply connection pool settings to the shared HTTP clients"""
+        http_client_service.configure(
+            max_connections=int(self._get_setting(db, "http_max_connections", "100")),
+            max_keepalive_connections=int(self._get_setting(db, "http_max_keepalive_connections", "20")),
+            keepalive_expiry=float(self._get_setting(db, "http_keepalive_expiry", "30")),
+            http2=self._get_setting(db, "http_http2", "true").lower() == "true"
+        )
+
+    def _get_http_client(self, db: Session, base_url: str):
+        """Get the shared pooled client for Ollama or Qdrant"""
+        self._configure_http_clients(db)
+        return http_client_service.get_client(base_url)
+
+    def _get_async_http_client(self, db: Session, base_url: str):
+        """Get the shared pooled async client for Ollama or Qdrant"""
+        self._configure_http_clients(db)
+        return http_client_service.get_async_client(base_url)
+
+    def warm_http_clients(self):
+        """Create the Ollama and Qdrant clients ahead of the first request"""
+        db = SessionLocal()
+        try:
+            for base_url in (self._get_ollama_url(db), self._get_qdrant_url(db)):
+                self._get_http_client(db, base_url)
+                self._get_async_http_client(db, base_url)
+        except Exception as e:
+            print(f"Warning: Failed to create HTTP clients: {e}")
+        finally:
+            db.close()
     
     def _get_ollama_url(self, db: Session):
         """Get Ollama URL from settings"""
         return self._get_setting(db, "ollama_url", "http://ollama:11434")
     
+    def _get_qdrant_url(self, db: Session):
+        """Get Qdrant REST base URL from settings"""
+        host = self._get_setting(db, "qdrant_host", "qdrant")
+        port = int(self._get_setting(db, "qdrant_port", "6333"))
+        return f"http://{host}:{port}"
+    
     def _get_default_collection_name(self, db: Session):
         """Get default collection name from settings"""
         return self._get_setting(db, "default_collection_name", "content")
@@ -50,15 +195,244 @@ class ContentService:
         """Get llama model from settings"""
         return self._get_setting(db, "llama_model", "llama3:latest")
     
-    def _get_qdrant_client(self, db: Session):
-        """Get or create Qdrant client with settings"""
-        if self._qdrant_client is not None:
-            return self._qdrant_client
+    def _get_chunking(self, db: Session):
+        """Get (mode, size, overlap) for splitting long payload fields from settings"""
+        return (
+            self._get_setting(db, "chunk_mode", "none"),
+            int(self._get_setting(db, "chunk_size", "256")),
+            int(self._get_setting(db, "chunk_overlap", "32"))
+        )
 
-        host = self._get_setting(db, "qdrant_host", "qdrant")
-        port = int(self._get_setting(db, "qdrant_port", "6333"))
-        self._qdrant_client = QdrantClient(url=f"http://{host}:{port}")
-        return self._qdrant_client
+    def _get_sync_signature(self, db: Session):
+        """Identify how rows are embedded, so changing the model, chunking or stored fields re-syncs them"""
+        signature = self._get_llama_model(db)
+        mode, size, overlap = self._get_chunking(db)
+        if mode != "none":
+            signature += f"|chunks:{mode}:{size}:{overlap}"
+        vector_fields = self._get_setting(db, "payload_vector_fields", "")
+        if _parse_collection_map(vector_fields):
+            # Indexed fields are always stored, so they count towards the projection too
+            projection = vector_fields + self._get_setting(db, "payload_index_fields", DEFAULT_PAYLOAD_INDEX_FIELDS)
+            signature += f"|payload:{hashlib.sha1(projection.encode('utf-8')).hexdigest()[:12]}"
+        return signature
+
+    def _get_payload_fields(self, db: Session, key: str, collection_name: str, default: str = ""):
+        """Get the payload fields a setting selects for a collection, or None for the whole payload"""
+        field_map = _parse_collection_map(self._get_setting(db, key, default))
+        fields = field_map.get(collection_name, field_map.get("*"))
+        return tuple(fields) if fields is not None else None
+
+    def _get_payload_indexes(self, db: Session, collection_name: str):
+        """Get the {field: schema} payload indexes a collection should have"""
+        index_map = _parse_collection_map(self._get_setting(db, "payload_index_fields", DEFAULT_PAYLOAD_INDEX_FIELDS))
+        return index_map.get(collection_name, index_map.get("*")) or {}
+
+    def _get_vector_fields(self, db: Session, collection_name: str):
+        """Get the fields stored in vector payloads, or None for the whole payload; indexed fields are always kept"""
+        fields = self._get_payload_fields(db, "payload_vector_fields", collection_name)
+        if fields is None:
+            return None
+        return fields + tuple(f for f in self._get_payload_indexes(db, collection_name) if f not in fields)
+
+    def _ensure_payload_indexes(self, db: Session, vector_store, collection_name: str, existing: dict):
+        """Create the configured payload indexes a collection is missing, so filters run in the index"""
+        for field, schema in self._get_payload_indexes(db, collection_name).items():
+            if field in existing:
+                continue
+            try:
+                vector_store.create_payload_index(collection_name, field, schema)
+            except Exception as e:
+                print(f"Warning: Failed to create payload index {field} ({schema}) on {collection_name}: {e}")
+
+    def _project_payload(self, payload: dict, fields):
+        """Keep only `fields` (plus the reserved ones) of a payload; None keeps it whole"""
+        if fields is None:
+            return payload
+        return {k: v for k, v in payload.items() if k in fields or k in RESERVED_PAYLOAD_FIELDS}
+
+    def _get_chunk_search_overfetch(self, db: Session):
+        """Get how many extra hits to fetch so collapsing chunks still fills the limit"""
+        if self._get_chunking(db)[0] == "none":
+            return 1
+        return max(1, int(self._get_setting(db, "chunk_search_overfetch", "4")))
+
+    def _get_embedding_batch_size(self, db: Session):
+        """Get number of texts sent per embedding request from settings"""
+        return int(self._get_setting(db, "embedding_batch_size", "32"))
+
+    def _get_embedding_concurrency(self, db: Session):
+        """Get number of embedding requests kept in flight from settings"""
+        return int(self._get_setting(db, "embedding_concurrency", "4"))
+
+    def _get_embedding_max_retries(self, db: Session):
+        """Get number of retries for a failed embedding batch from settings"""
+        return int(self._get_setting(db, "embedding_max_retries", "3"))
+
+    def _configure_embedding_cache(self, db: Session):
+        """Apply embedding cache settings"""
+        embedding_cache.configure(
+            enabled=self._get_setting(db, "embedding_cache_enabled", "true").lower() == "true",
+            memory_items=int(self._get_setting(db, "embedding_cache_memory_items", "2000")),
+            disk_items=int(self._get_setting(db, "embedding_cache_disk_items", "100000"))
+        )
+
+    def _configure_query_batching(self, db: Session):
+        """Apply query embedding micro-batching settings"""
+        embedding_service.configure_query_batching(
+            window_ms=float(self._get_setting(db, "query_embedding_batch_window_ms", "5")),
+            max_items=int(self._get_setting(db, "query_embedding_batch_max_items", "32"))
+        )
+
+    def get_embedding_cache_stats(self):
+        """Get hit/miss counters of the embedding cache"""
+        return embedding_cache.stats()
+
+    def _configure_search_cache(self, db: Session):
+        """Apply search result cache settings, returning whether the cache is enabled"""
+        self._search_cache.configure(
+            max_items=int(self._get_setting(db, "search_cache_max_items", "1000")),
+            ttl=float(self._get_setting(db, "search_cache_ttl_seconds", "300"))
+        )
+        return self._get_setting(db, "search_cache_enabled", "true").lower() == "true"
+
+    def _configure_answer_cache(self, db: Session):
+        """Apply chat answer cache settings, returning whether the cache is enabled"""
+        self._answer_cache.configure(
+            max_items=int(self._get_setting(db, "answer_cache_max_items", "500")),
+            ttl=float(self._get_setting(db, "answer_cache_ttl_seconds", "3600"))
+        )
+        return self._get_setting(db, "answer_cache_enabled", "false").lower() == "true"
+
+    def _configure_chat_sessions(self, db: Session):
+        """Apply chat session limits from settings, returning whether sessions are enabled"""
+        chat_session_store.configure(
+            max_sessions=int(self._get_setting(db, "chat_session_max_items", "1000")),
+            ttl=float(self._get_setting(db, "chat_session_ttl_seconds", "1800")),
+            max_context_tokens=int(self._get_setting(db, "chat_session_max_context_tokens", "2000000"))
+        )
+        return self._get_setting(db, "chat_sessions_enabled", "true").lower() == "true"
+
+    def _get_ollama_keep_alive(self, db: Session):
+        """Get how long Ollama keeps the chat model loaded after a request (empty for its default)"""
+        return self._get_setting(db, "ollama_keep_alive", "")
+
+    def get_chat_session(self, session_id: str):
+        """Get a chat session's context size and per-turn timings"""
+        session = chat_session_store.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Chat session '{session_id}' not found")
+        return session.describe()
+
+    def delete_chat_session(self, session_id: str):
+        """Forget a chat session"""
+        if not chat_session_store.delete(session_id):
+            raise HTTPException(status_code=404, detail=f"Chat session '{session_id}' not found")
+        return {"deleted": session_id}
+
+    def get_chat_session_stats(self):
+        """Get chat session store counters"""
+        return chat_session_store.stats()
+
+    def get_answer_cache_stats(self):
+        """Get chat answer cache counters"""
+        return self._answer_cache.stats()
+
+    def get_search_cache_stats(self):
+        """Get hit/miss counters of the search result cache"""
+        return self._search_cache.stats()
+
+    def _bump_generations(self, db: Session, collection_names):
+        """Invalidate cached search results for collections whose stored points changed"""
+        collection_names = sorted({c for c in collection_names if c is not None})
+        if not collection_names:
+            return
+        stmt = mysql_insert(RfyCollectionState).values(
+            [{"collection_name": c, "generation": 1} for c in collection_names]
+        )
+        db.execute(stmt.on_duplicate_key_update(generation=RfyCollectionState.generation + 1))
+        db.commit()
+        for collection_name in collection_names:
+            self._generations.pop(collection_name, None)
+
+    def _load_generations(self, db: Session, collection_names: list):
+        """Read collections' generations from the database in one query and remember them"""
+        generations = dict(
+            db.query(RfyCollectionState.collection_name, RfyCollectionState.generation)
+            .filter(RfyCollectionState.collection_name.in_(collection_names))
+        )
+        # End the read transaction so the next check sees bumps from other processes
+        db.commit()
+        now = time.monotonic()
+        for collection_name in collection_names:
+            self._generations[collection_name] = (generations.get(collection_name) or 0, now)
+        return {name: generations.get(name) or 0 for name in collection_names}
+
+    async def _aget_generations(self, db: Session, collection_names: list):
+        """Get {collection: generation}, re-reading each at most every search_cache_generation_check_ms.
+
+        Bumps made by this process are seen immediately; bumps from other
+        processes (sync workers, other API workers) within the check interval.
+        Stale entries are re-read in a single threadpool call, since the
+        request's session must not be used from several threads at once.
+        """
+        max_age = float(self._get_setting(db, "search_cache_generation_check_ms", "1000")) / 1000.0
+        now = time.monotonic()
+        generations = {}
+        stale = []
+        for collection_name in collection_names:
+            cached = self._generations.get(collection_name)
+            if cached is not None and now - cached[1] < max_age:
+                generations[collection_name] = cached[0]
+            else:
+                stale.append(collection_name)
+        if stale:
+            generations.update(await run_in_threadpool(self._load_generations, db, stale))
+        return generations
+
+    def _lexical_index_enabled(self, db: Session):
+        """Whether synced rows are added to the BM25 index, from settings"""
+        return self._get_setting(db, "lexical_index_enabled", "true").lower() == "true"
+
+    def _get_hybrid_rrf_k(self, db: Session):
+        """Get the reciprocal rank fusion constant for hybrid search from settings"""
+        return int(self._get_setting(db, "hybrid_rrf_k", "60"))
+
+    def _get_hybrid_candidate_limit(self, db: Session):
+        """Get how many hits each side of a hybrid search contributes from settings"""
+        return int(self._get_setting(db, "hybrid_candidate_limit", "20"))
+
+    def _get_bulk_insert_batch_size(self, db: Session):
+        """Get number of rows per INSERT for bulk ingestion from settings"""
+        return int(self._get_setting(db, "bulk_insert_batch_size", "1000"))
+
+    def _get_sync_lease_seconds(self, db: Session):
+        """Get how long a sync worker may hold claimed rows from settings"""
+        return int(self._get_setting(db, "sync_lease_seconds", "300"))
+
+    def _get_vector_store(self, db: Session):
+        """Get the vector store backend selected by the vector_store_backend setting"""
+        self._configure_http_clients(db)
+        if self._vector_store is not None:
+            return self._vector_store
+        backend = self._get_setting(db, "vector_store_backend", "qdrant")
+        if backend == "qdrant":
+            oversampling = self._get_setting(db, "qdrant_search_oversampling", "")
+            hnsw_ef = self._get_setting(db, "qdrant_search_hnsw_ef", "")
+            self._vector_store = QdrantVectorStore(
+                self._get_qdrant_url(db),
+                profile=self._get_setting(db, "qdrant_collection_profile", "float32"),
+                hnsw_m=int(self._get_setting(db, "qdrant_hnsw_m", "16")),
+                hnsw_ef_construct=int(self._get_setting(db, "qdrant_hnsw_ef_construct", "100")),
+                oversampling=float(oversampling) if oversampling else None,
+                hnsw_ef=int(hnsw_ef) if hnsw_ef else None
+            )
+        elif backend == "numpy":
+            self._vector_store = NumpyVectorStore(self._get_setting(
+                db, "vector_store_path", os.getenv("VECTOR_STORE_DIR", "/app/data/vector_store")
+            ))
+        else:
+            raise ValueError(f"Unknown vector_store_backend '{backend}'")
+        return self._vector_store
     
     def _get_rag_context_template(self, db: Session):
         """Get RAG context template from settings"""
@@ -68,6 +442,18 @@ class ContentService:
             "You are a helpful assistant. The user asked: '{prompt}'.\nHere is some relevant content that may help answer their question:\n{content_list}\nPlease answer the user's question using this context when relevant."
         )
     
+    def _get_rag_context_item_template(self, db: Session):
+        """Get the template each search hit's payload fields are rendered into"""
+        return self._get_setting(db, "rag_context_item_template", "- {title}: {url}")
+
+    def _get_rag_context_token_budget(self, db: Session):
+        """Get the token budget of the assembled chat prompt (0 for no limit) from settings"""
+        return int(self._get_setting(db, "rag_context_token_budget", "2048"))
+
+    def _get_rag_context_max_items(self, db: Session):
+        """Get how many search hits chat retrieves as context candidates from settings"""
+        return int(self._get_setting(db, "rag_context_max_items", "5"))
+
     def _get_rag_context_search_failed(self, db: Session):
         """Get RAG context for search failed from settings"""
         return self._get_setting(
@@ -84,46 +470,220 @@ class ContentService:
             "You are a helpful assistant. The user asked: '{prompt}'.\nNo relevant content was found. Please answer as best as you can."
         )
 
+    def _build_embedding_text(self, content):
+        """Convert a buffer row to text for embedding - format for better searchability"""
+        text_parts = []
+        if content.source_id:
+            text_parts.append(f"Source ID: {content.source_id}")
+        
+        # Convert payload fields to a more searchable text format
+        if isinstance(content.payload, dict):
+            for key, value in content.payload.items():
+                if isinstance(value, str):
+                    text_parts.append(f"{key}: {value}")
+                else:
+                    text_parts.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
+            return " ".join(text_parts)
+        return json.dumps(content.payload, ensure_ascii=False)
+
+    def _build_embedding_chunks(self, content, chunking):
+        """Texts to embed for a buffer row: one, or one per chunk of its long string fields.
+
+        Every chunk carries the row's short fields, so each point keeps the
+        context (title, source id) that makes it findable on its own.
+        """
+        mode, size, overlap = chunking
+        if mode == "none" or not isinstance(content.payload, dict):
+            return [self._build_embedding_text(content)]
+        header = [f"Source ID: {content.source_id}"] if content.source_id else []
+        long_fields = []
+        for key, value in content.payload.items():
+            if isinstance(value, str) and len(value.split()) > size:
+                long_fields.append((key, value))
+            elif isinstance(value, str):
+                header.append(f"{key}: {value}")
+            else:
+                header.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
+        if not long_fields:
+            return [self._build_embedding_text(content)]
+        header = " ".join(header)
+        return [
+            f"{header} {key}: {piece}".strip()
+            for key, value in long_fields
+            for piece in text_chunker.chunk(value, mode, size, overlap)
+        ]
+
+    def _chunk_point_id(self, content_id: int, chunk_index: int):
+        """Stable point id of a row's chunk; the first chunk keeps the row id"""
+        if chunk_index == 0:
+            return content_id
+        return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{content_id}:{chunk_index}"))
+
+    def _chunk_point_ids(self, content_id: int, chunk_count: int = None, start: int = 0):
+        return [self._chunk_point_id(content_id, i) for i in range(start, chunk_count or 1)]
+
+    def _content_values(self, source_id: str, collection_name: str, payload: dict):
+        """Column values for a buffer row as sent by a client"""
+        return {
+            "source_id": source_id,
+            "collection_name": collection_name,
+            "payload": payload,
+            "content_hash": RfyContentBuffer.compute_hash(source_id, payload),
+            "is_dirty": True,
+        }
+
+    def _upsert_statement(self):
+        """INSERT that updates the existing (collection_name, source_id) row in place.
+
+        The row is only rewritten and marked dirty when its content hash changed,
+        so re-sending an unchanged item costs nothing at the next sync.
+        LAST_INSERT_ID(id) makes the existing row's id available as lastrowid.
+        """
+        table = RfyContentBuffer.__table__
+        stmt = mysql_insert(table)
+        unchanged = table.c.content_hash.is_not_distinct_from(stmt.inserted.content_hash)
+        # MySQL applies these in order, so content_hash must be assigned last
+        return stmt.on_duplicate_key_update([
+            ("id", func.LAST_INSERT_ID(table.c.id)),
+            ("payload", func.IF(unchanged, table.c.payload, stmt.inserted.payload)),
+            ("is_dirty", func.IF(unchanged, table.c.is_dirty, true())),
+            ("updated_at", func.IF(unchanged, table.c.updated_at, func.now())),
+            ("content_hash", stmt.inserted.content_hash),
+        ])
+
     def add_content(self, db: Session, source_id: str, collection_name: str, payload: dict):
-        """Add content to the rfy_content_buffer table"""
+        """Add content to the rfy_content_buffer table, updating the row for an existing source_id"""
         try:
-            content = RfyContentBuffer(
-                source_id=source_id,
-                collection_name=collection_name,
-                payload=payload
+            result = db.execute(
+                self._upsert_statement().values(**self._content_values(source_id, collection_name, payload))
             )
-            db.add(content)
             db.commit()
-            db.refresh(content)
-            return {"status": "success", "id": content.id, "source_id": source_id, "collection_name": collection_name}
+            return {"status": "success", "id": result.lastrowid, "source_id": source_id, "collection_name": collection_name}
         except Exception as e:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to add content: {str(e)}")
     
+    def _upsert_content_batch(self, db: Session, rows: list):
+        """Upsert a batch of (line, values) rows, returning (upserted, errors).
+
+        The whole batch goes out as one executemany; if that fails the rows are
+        retried one by one so a single bad row only fails its own line.
+        """
+        stmt = self._upsert_statement()
+        try:
+            db.execute(stmt, [values for _, values in rows])
+            db.commit()
+            return len(rows), []
+        except Exception:
+            db.rollback()
+        upserted = 0
+        errors = []
+        for line, values in rows:
+            try:
+                db.execute(stmt, [values])
+                db.commit()
+                upserted += 1
+            except Exception as e:
+                db.rollback()
+                errors.append({"line": line, "error": str(e)})
+        return upserted, errors
+
+    async def add_content_bulk(self, db: Session, body, batch_size: int = None, max_errors: int = 1000):
+        """Stream NDJSON or a JSON array of content items into the buffer in batched upserts.
+
+        `body` is an async iterator of byte chunks. Only the current batch is held
+        in memory, and per-line errors are reported without aborting the load.
+        """
+        await self._ensure_settings_loaded(db)
+        if not batch_size:
+            batch_size = self._get_bulk_insert_batch_size(db)
+        parser = BulkRecordParser()
+        rows = []
+        errors = []
+        total_errors = 0
+        total_upserted = 0
+        total_lines = 0
+
+        def add_error(error):
+            nonlocal total_errors
+            total_errors += 1
+            if len(errors) < max_errors:
+                errors.append(error)
+
+        async def flush():
+            nonlocal total_upserted, rows
+            if not rows:
+                return
+            upserted, batch_errors = await run_in_threadpool(self._upsert_content_batch, db, rows)
+            total_upserted += upserted
+            for error in batch_errors:
+                add_error(error)
+            rows = []
+
+        async def consume(records):
+            nonlocal total_lines
+            for line, record, error in records:
+                total_lines += 1
+                if error:
+                    add_error({"line": line, "error": error})
+                    continue
+                try:
+                    item = ContentCreateRequest.model_validate(record)
+                except ValidationError as e:
+                    add_error({"line": line, "error": str(e)})
+                    continue
+                rows.append((line, self._content_values(item.source_id, item.collection_name, item.payload)))
+                if len(rows) >= batch_size:
+                    await flush()
+
+        try:
+            async for chunk in body:
+                await consume(parser.feed(chunk))
+            await consume(parser.close())
+            await flush()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to add content: {str(e)}")
+
+        return {
+            "status": "success" if total_errors == 0 else "partial",
+            "lines": total_lines,
+            "upserted": total_upserted,
+            "failed": total_errors,
+            "errors": errors,
+            "errors_truncated": total_errors > len(errors)
+        }
+
     def delete_content(self, db: Session, content_id: int):
         """Delete content from database and Qdrant"""
         try:
+            self._refresh_settings(db)
             content = db.query(RfyContentBuffer).filter(RfyContentBuffer.id == content_id).first()
             if not content:
                 raise HTTPException(status_code=404, detail="Content not found")
             
             collection_name = content.collection_name
-            qdrant_client = self._get_qdrant_client(db)
             
-            # Delete from Qdrant
+            # Delete from database, leaving a tombstone so the next sync can retry
+            # the Qdrant deletion if it fails here
+            tombstone = RfyContentTombstone(
+                content_id=content_id, collection_name=collection_name, chunk_count=content.chunk_count
+            )
+            db.add(tombstone)
+            db.delete(content)
+            lexical_index_service.remove_documents(db, [content_id])
+            db.commit()
+            
+            # Delete from the vector store
             try:
-                qdrant_client.delete(
-                    collection_name=collection_name,
-                    points_selector=[content_id]
-                )
+                self._get_vector_store(db).delete(collection_name, self._chunk_point_ids(content_id, content.chunk_count))
+                db.delete(tombstone)
+                db.commit()
+                self._bump_generations(db, [collection_name])
             except Exception as e:
                 # Log but don't fail if Qdrant deletion fails
+                db.rollback()
                 print(f"Warning: Failed to delete from Qdrant: {e}")
             
-            # Delete from database
-            db.delete(content)
-            db.commit()
-            
             return {"status": "success", "id": content_id}
         except HTTPException:
             raise
@@ -131,191 +691,774 @@ class ContentService:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to delete content: {str(e)}")
     
-    def get_all_content(self, db: Session, collection_name: str = None):
-        """Get all content from database"""
+    def _content_query(self, db: Session, collection_name: str = None, after_id: int = None):
+        """Buffer rows ordered by id, starting after the given keyset cursor"""
+        query = db.query(
+            RfyContentBuffer.id,
+            RfyContentBuffer.source_id,
+            RfyContentBuffer.collection_name,
+            RfyContentBuffer.payload
+        )
+        if collection_name:
+            query = query.filter(RfyContentBuffer.collection_name == collection_name)
+        if after_id is not None:
+            query = query.filter(RfyContentBuffer.id > after_id)
+        return query.order_by(RfyContentBuffer.id)
+
+    def _serialize_content(self, content):
+        return {
+            "id": content.id,
+            "source_id": content.source_id,
+            "collection_name": content.collection_name,
+            "payload": content.payload
+        }
+
+    def get_content_page(self, db: Session, collection_name: str = None, limit: int = 100, after_id: int = None):
+        """Get one page of content, with the cursor to pass as after_id for the next page"""
         try:
-            query = db.query(RfyContentBuffer)
-            if collection_name:
-                query = query.filter(RfyContentBuffer.collection_name == collection_name)
-            contents = query.all()
-            return [
-                {
-                    "id": content.id,
-                    "source_id": content.source_id,
-                    "collection_name": content.collection_name,
-                    "payload": content.payload
-                }
-                for content in contents
-            ]
+            contents = self._content_query(db, collection_name, after_id).limit(limit + 1).all()
+            next_after_id = contents[limit - 1].id if len(contents) > limit else None
+            return {
+                "items": [self._serialize_content(content) for content in contents[:limit]],
+                "next_after_id": next_after_id
+            }
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get content: {str(e)}")
 
-    def process_content(self, db: Session, collection_name: str = None):
-        """Process content from buffer and sync to Qdrant"""
+    def stream_content(self, collection_name: str = None, after_id: int = None, limit: int = None):
+        """Yield content as NDJSON lines, reading rows from the database in chunks.
+
+        Uses its own session because the response body outlives the request's.
+        """
+        db = SessionLocal()
+        try:
+            query = self._content_query(db, collection_name, after_id)
+            if limit:
+                query = query.limit(limit)
+            for content in query.execution_options(yield_per=1000):
+                yield json.dumps(self._serialize_content(content), ensure_ascii=False, default=str) + "\n"
+        finally:
+            db.close()
+
+    def _dirty_filter(self, sync_signature: str):
+        """Rows that are new, modified, or were embedded with a different model or chunking"""
+        return or_(
+            RfyContentBuffer.is_dirty.is_(True),
+            RfyContentBuffer.synced_model != sync_signature
+        )
+
+    def _mark_synced(self, db: Session, rows: list, sync_signature: str):
+        """Clear the dirty flag on synced (content, content_hash, chunk_count) rows.
+
+        Rows that changed while being embedded are left dirty.
+        """
+        if not rows:
+            return
+        table = RfyContentBuffer.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .where(func.coalesce(table.c.content_hash, "") == bindparam("b_guard"))
+            .values(
+                content_hash=bindparam("b_hash"),
+                synced_hash=bindparam("b_hash"),
+                synced_model=sync_signature,
+                chunk_count=bindparam("b_chunks"),
+                is_dirty=False,
+                synced_at=datetime.utcnow(),
+                lease_owner=None,
+                lease_expires_at=None
+            )
+        )
+        db.execute(stmt, [
+            {"b_id": content.id, "b_guard": content.content_hash or "", "b_hash": content_hash, "b_chunks": chunk_count}
+            for content, content_hash, chunk_count in rows
+        ])
+        db.commit()
+
+    def _index_lexical(self, db: Session, rows: list):
+        """Refresh the BM25 postings of synced rows; committed together with _mark_synced"""
+        lexical_index_service.index_documents(db, [
+            (content.id, content.collection_name, self._build_embedding_text(content))
+            for content, _, _ in rows
+        ])
+
+    def new_worker_id(self):
+        """Unique lease owner id for a sync run"""
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[-64:]
+
+    def _claim_rows(self, db: Session, query, worker_id: str, after_id: int, limit: int, lease_seconds: int):
+        """Lease the next chunk of dirty rows so concurrent workers get disjoint chunks.
+
+        Rows locked by another worker's claim are skipped rather than waited on,
+        and rows whose lease has expired (their worker died) are claimable again.
+        """
+        now = datetime.utcnow()
+        rows = (
+            query.filter(
+                RfyContentBuffer.id > after_id,
+                or_(RfyContentBuffer.lease_expires_at.is_(None), RfyContentBuffer.lease_expires_at < now)
+            )
+            .order_by(RfyContentBuffer.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if rows:
+            db.query(RfyContentBuffer).filter(
+                RfyContentBuffer.id.in_([row.id for row in rows])
+            ).update({
+                "lease_owner": worker_id,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds)
+            }, synchronize_session=False)
+        db.commit()
+        return rows
+
+    def _renew_lease(self, db: Session, ids: list, worker_id: str, lease_seconds: int):
+        """Extend the lease on rows this worker still holds, so a slow chunk is not claimed twice"""
+        db.query(RfyContentBuffer).filter(
+            RfyContentBuffer.id.in_(ids),
+            RfyContentBuffer.lease_owner == worker_id
+        ).update({
+            "lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)
+        }, synchronize_session=False)
+        db.commit()
+
+    def _release_rows(self, db: Session, ids: list, worker_id: str):
+        """Give up leases on rows that could not be synced so others can retry them"""
+        db.query(RfyContentBuffer).filter(
+            RfyContentBuffer.id.in_(ids),
+            RfyContentBuffer.lease_owner == worker_id
+        ).update({"lease_owner": None, "lease_expires_at": None}, synchronize_session=False)
+        db.commit()
+
+    def _purge_deleted(self, db: Session, vector_store, collection_name: str = None):
+        """Remove Qdrant points for buffer rows that have been deleted"""
+        query = db.query(RfyContentTombstone)
+        if collection_name:
+            query = query.filter(RfyContentTombstone.collection_name == collection_name)
+        query = query.order_by(RfyContentTombstone.id).limit(1000).with_for_update(skip_locked=True)
+        tombstones = query.all()
+        total_deleted = 0
+        while tombstones:
+            by_collection = {}
+            for tombstone in tombstones:
+                by_collection.setdefault(tombstone.collection_name, []).append(tombstone)
+            purged = []
+            for coll_name, coll_tombstones in by_collection.items():
+                try:
+                    vector_store.delete(coll_name, [
+                        point_id for t in coll_tombstones
+                        for point_id in self._chunk_point_ids(t.content_id, t.chunk_count)
+                    ])
+                    purged.extend(coll_tombstones)
+                except Exception as e:
+                    print(f"Warning: Failed to delete from vector store collection '{coll_name}': {e}")
+            if not purged:
+                db.rollback()
+                break
+            db.query(RfyContentTombstone).filter(
+                RfyContentTombstone.id.in_([t.id for t in purged])
+            ).delete(synchronize_session=False)
+            db.commit()
+            self._bump_generations(db, [t.collection_name for t in purged])
+            total_deleted += len(purged)
+            if len(purged) < len(tombstones):
+                break
+            tombstones = query.all()
+        return total_deleted
+
+    def count_pending_content(self, db: Session, collection_name: str = None):
+        """Count buffer rows that the next sync will need to look at"""
+        self._refresh_settings(db)
+        query = db.query(func.count(RfyContentBuffer.id)).filter(
+            self._dirty_filter(self._get_sync_signature(db))
+        )
+        if collection_name:
+            query = query.filter(RfyContentBuffer.collection_name == collection_name)
+        return query.scalar() or 0
+
+    def process_content(self, db: Session, collection_name: str = None, progress=None, worker_id: str = None):
+        """Sync new and modified buffer rows to Qdrant and remove deleted ones.
+
+        Rows are leased in chunks under `worker_id`, so several processes can run
+        this concurrently. `progress`, if given, is called as
+        progress(rows_done, rows_failed) after every batch.
+        """
+        worker_id = worker_id or self.new_worker_id()
         try:
-            qdrant_client = self._get_qdrant_client(db)
+            self._refresh_settings(db)
+            vector_store = self._get_vector_store(db)
             ollama_url = self._get_ollama_url(db)
             llama_model = self._get_llama_model(db)
+            sync_signature = self._get_sync_signature(db)
+            chunking = self._get_chunking(db)
             vector_size = self._get_vector_size(db)
+            batch_size = self._get_embedding_batch_size(db)
+            concurrency = self._get_embedding_concurrency(db)
+            max_retries = self._get_embedding_max_retries(db)
+            lease_seconds = self._get_sync_lease_seconds(db)
+            index_lexical = self._lexical_index_enabled(db)
+            self._configure_embedding_cache(db)
+            chunk_size = batch_size * concurrency * 4
             
-            query = db.query(RfyContentBuffer)
+            # Load plain column rows rather than ORM objects so commits between
+            # batches don't expire and reload them
+            query = db.query(
+                RfyContentBuffer.id,
+                RfyContentBuffer.source_id,
+                RfyContentBuffer.collection_name,
+                RfyContentBuffer.payload,
+                RfyContentBuffer.content_hash,
+                RfyContentBuffer.synced_hash,
+                RfyContentBuffer.synced_model,
+                RfyContentBuffer.chunk_count
+            ).filter(self._dirty_filter(sync_signature))
             if collection_name:
                 query = query.filter(RfyContentBuffer.collection_name == collection_name)
             
-            contents = query.all()
-            if not contents:
-                return {"status": "no content found"}
-            
-            # Group by collection_name
-            collections = {}
-            for content in contents:
-                if content.collection_name not in collections:
-                    collections[content.collection_name] = []
-                collections[content.collection_name].append(content)
+            # Index settings can change without any row becoming dirty, so every
+            # target collection gets its payload indexes checked, not only synced ones
+            if collection_name:
+                target_collections = [collection_name]
+            else:
+                target_collections = [
+                    name for (name,) in db.query(RfyContentBuffer.collection_name).distinct() if name is not None
+                ]
+            indexed_collections = set()
+            for coll_name in target_collections:
+                info = vector_store.collection_info(coll_name)
+                if info is not None:
+                    self._ensure_payload_indexes(db, vector_store, coll_name, info.get("payload_indexes") or {})
+                    indexed_collections.add(coll_name)
             
             total_processed = 0
-            for coll_name, coll_contents in collections.items():
-                # Ensure collection exists in Qdrant
+            total_unchanged = 0
+            stats = EmbeddingStats()
+            ensured_collections = set()
+            last_id = 0
+            while True:
+                # Walk dirty rows in id order so memory stays bounded by chunk_size;
+                # rows that fail are left behind the cursor for the next sync
+                contents = self._claim_rows(db, query, worker_id, last_id, chunk_size, lease_seconds)
+                if not contents:
+                    break
+                last_id = contents[-1].id
+                content_ids = [content.id for content in contents]
+                leased_at = time.monotonic()
+                
+                changed_collections = set()
                 try:
-                    qdrant_client.get_collection(coll_name)
-                except Exception:
-                    qdrant_client.recreate_collection(
-                        collection_name=coll_name,
-                        vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
-                    )
+                    # Rows flagged dirty whose content matches what is already in Qdrant
+                    # only need their flag cleared
+                    unchanged = []
+                    collections = {}
+                    for content in contents:
+                        content_hash = RfyContentBuffer.compute_hash(content.source_id, content.payload)
+                        if content.synced_hash == content_hash and content.synced_model == sync_signature:
+                            unchanged.append((content, content_hash, content.chunk_count))
+                        else:
+                            collections.setdefault(content.collection_name, []).append((content, content_hash))
+                    if index_lexical:
+                        self._index_lexical(db, unchanged)
+                    self._mark_synced(db, unchanged, sync_signature)
+                    total_unchanged += len(unchanged)
+                    if progress and unchanged:
+                        progress(total_processed + total_unchanged, stats.rows_failed)
                 
-                points = []
-                for content in coll_contents:
-                    # Convert payload to text for embedding - format for better searchability
-                    text_parts = []
-                    if content.source_id:
-                        text_parts.append(f"Source ID: {content.source_id}")
-                    
-                    # Convert payload fields to a more searchable text format
-                    if isinstance(content.payload, dict):
-                        for key, value in content.payload.items():
-                            if isinstance(value, str):
-                                text_parts.append(f"{key}: {value}")
-                            else:
-                                text_parts.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
-                        text = " ".join(text_parts)
-                    else:
-                        text = json.dumps(content.payload, ensure_ascii=False)
-                    
-                    try:
-                        resp = httpx.post(
-                            f"{ollama_url}/api/embeddings",
-                            json={"model": llama_model, "prompt": text},
-                            timeout=60.0
-                        )
-                        resp.raise_for_status()
-                        embedding = resp.json()["embedding"]
-                    except Exception as e:
-                        print(f"Failed to generate embedding for content {content.id}: {e}")
-                        continue
+                    for coll_name, coll_contents in collections.items():
+                        vector_fields = self._get_vector_fields(db, coll_name)
+                        # Ensure collection and its payload indexes exist in Qdrant
+                        if coll_name not in ensured_collections:
+                            if coll_name not in indexed_collections:
+                                vector_store.create_collection(coll_name, vector_size)
+                                self._collections.pop(coll_name, None)
+                                self._ensure_payload_indexes(db, vector_store, coll_name, {})
+                                indexed_collections.add(coll_name)
+                            ensured_collections.add(coll_name)
                     
-                    points.append(
-                        PointStruct(
-                            id=content.id,
-                            vector=embedding,
-                            payload={
-                                "source_id": content.source_id,
-                                "collection_name": content.collection_name,
-                                **content.payload
-                            }
-                        )
-                    )
-                
-                if points:
-                    qdrant_client.upsert(collection_name=coll_name, points=points)
-                    total_processed += len(points)
+                        # A row is synced once every one of its chunks is upserted
+                        contents_by_id = {}
+                        remaining = {}
+                        items = []
+                        for content, content_hash in coll_contents:
+                            chunks = self._build_embedding_chunks(content, chunking)
+                            contents_by_id[content.id] = (content, content_hash, len(chunks))
+                            remaining[content.id] = len(chunks)
+                            items.extend(((content.id, i), text) for i, text in enumerate(chunks))
+                        for result in embedding_service.embed_stream(
+                            ollama_url, llama_model, items,
+                            batch_size=batch_size, concurrency=concurrency,
+                            max_retries=max_retries, stats=stats
+                        ):
+                            points = []
+                            synced = []
+                            stale_ids = []
+                            for ((content_id, chunk_index), _), embedding in zip(result.items, result.embeddings):
+                                content, content_hash, chunk_count = contents_by_id[content_id]
+                                payload = self._project_payload({
+                                    "source_id": content.source_id,
+                                    "collection_name": content.collection_name,
+                                    **content.payload
+                                }, vector_fields)
+                                if chunk_count > 1:
+                                    payload["parent_id"] = content.id
+                                    payload["chunk_index"] = chunk_index
+                                points.append({
+                                    "id": self._chunk_point_id(content.id, chunk_index),
+                                    "vector": embedding,
+                                    "payload": payload
+                                })
+                                remaining[content_id] -= 1
+                                if remaining[content_id] == 0:
+                                    synced.append((content, content_hash, chunk_count))
+                                    # Chunks beyond the new count belong to a longer old version
+                                    stale_ids.extend(self._chunk_point_ids(content.id, content.chunk_count, start=chunk_count))
+                            if points:
+                                vector_store.upsert(coll_name, points)
+                                changed_collections.add(coll_name)
+                            if stale_ids:
+                                vector_store.delete(coll_name, stale_ids)
+                            if synced:
+                                if index_lexical:
+                                    self._index_lexical(db, synced)
+                                self._mark_synced(db, synced, sync_signature)
+                                total_processed += len(synced)
+                            if progress:
+                                progress(total_processed + total_unchanged, stats.rows_failed)
+                            # Renew once half the lease is used up, so it never lapses
+                            # mid-chunk however slow the embedding is
+                            if time.monotonic() - leased_at > lease_seconds / 2:
+                                self._renew_lease(db, content_ids, worker_id, lease_seconds)
+                                leased_at = time.monotonic()
+                finally:
+                    # A chunk that fails part way still gives up its leases, and the
+                    # points it already upserted invalidate cached searches
+                    db.rollback()
+                    self._release_rows(db, content_ids, worker_id)
+                    self._bump_generations(db, changed_collections)
             
-            return {"status": "success", "content_processed": total_processed, "collections": list(collections.keys())}
+            total_deleted = self._purge_deleted(db, vector_store, collection_name)
+            
+            return {
+                "status": "success",
+                "content_processed": total_processed,
+                "content_unchanged": total_unchanged,
+                "content_failed": stats.rows_failed,
+                "content_deleted": total_deleted,
+                "collections": sorted(c for c in ensured_collections if c is not None),
+                **stats.summary()
+            }
         except Exception as e:
+            db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to process content: {str(e)}")
 
-    def search_content(self, request: SearchRequest, db: Session):
-        """Search content in Qdrant"""
-        collection_name = request.collection_name or self._get_default_collection_name(db)
+    async def _acollection_info(self, db: Session, collection_name: str, generation: int):
+        """Get existence, vector size and point count of a vector store collection.
+
+        The answer is cached until the collection's generation changes, so the
+        vector store round trip is only paid again after a sync or delete touched it.
+        """
+        info = self._collections.get(collection_name)
+        if info is not None and info["generation"] == generation:
+            return info
+        store_info = await self._get_vector_store(db).acollection_info(collection_name)
+        info = {
+            "exists": store_info is not None,
+            "vector_size": store_info["vector_size"] if store_info else None,
+            "points_count": store_info["points_count"] if store_info else 0,
+            "generation": generation,
+        }
+        self._collections[collection_name] = info
+        return info
+
+    async def _aexisting_collections(self, db: Session, collection_names: list, generations: dict):
+        """Keep the collections that exist in the vector store, checked concurrently"""
+        infos = await asyncio.gather(*(
+            self._acollection_info(db, name, generations[name]) for name in collection_names
+        ))
+        return [name for name, info in zip(collection_names, infos) if info["exists"]]
+
+    async def _aembed_query(self, db: Session, text: str):
+        """Embed a search query without blocking the event loop"""
+        self._configure_embedding_cache(db)
+        self._configure_query_batching(db)
+        return await embedding_service.aembed_query(self._get_ollama_url(db), self._get_llama_model(db), text)
+
+    def _collapse_chunks(self, hits: list, limit: int):
+        """Keep the best-scoring chunk of each row, reported under the row id"""
+        collapsed = {}
+        for hit in hits:
+            payload = hit.get("payload") or {}
+            parent_id = payload.get("parent_id", hit["id"])
+            if parent_id in collapsed:
+                continue
+            payload = {k: v for k, v in payload.items() if k not in ("parent_id", "chunk_index")}
+            collapsed[parent_id] = {**hit, "id": parent_id, "payload": payload}
+            if len(collapsed) >= limit:
+                break
+        return list(collapsed.values())
+
+    def _hydrate_payloads(self, hits: list, fields):
+        """Fill payload fields the vector store doesn't hold from the content buffer, by row id"""
+        db = SessionLocal()
+        try:
+            rows = dict(
+                db.query(RfyContentBuffer.id, RfyContentBuffer.payload)
+                .filter(RfyContentBuffer.id.in_([hit["id"] for hit in hits]))
+            )
+        finally:
+            db.close()
+        for hit in hits:
+            payload = rows.get(hit["id"]) or {}
+            for key in payload if fields is None else fields:
+                if key in payload and key not in hit["payload"]:
+                    hit["payload"][key] = payload[key]
+        return hits
+
+    async def _asearch(self, db: Session, collection_name: str, query_embedding: list, limit: int,
+                       fields=None, query_filter: dict = None, mmr: dict = None):
+        """Search a collection in the vector store without blocking the event loop.
+
+        Only `fields` (None for all) are returned; those left out of the vector
+        payload by `payload_vector_fields` are loaded from MySQL for the final hits.
+        `query_filter` is applied by the store, inside its payload indexes. With
+        `mmr` ({"lambda_mult", "fetch_k"}) `fetch_k` candidates are fetched with
+        their vectors and re-ranked to a diverse top-`limit`.
+        """
+        vector_fields = self._get_vector_fields(db, collection_name)
+        if query_filter and vector_fields is not None:
+            unstored = [f for f in list(query_filter.get("match") or {}) + list(query_filter.get("range") or {})
+                        if f not in vector_fields and f not in RESERVED_PAYLOAD_FIELDS]
+            # The store would match nothing, which looks like a real empty answer
+            if unstored:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Filter fields {unstored} are not stored in '{collection_name}' vector payloads; "
+                           f"add them to payload_index_fields"
+                )
+        if vector_fields is None:
+            with_payload = True if fields is None else list(RESERVED_PAYLOAD_FIELDS) + list(fields)
+            missing = ()
+        elif fields is None:
+            with_payload = list(RESERVED_PAYLOAD_FIELDS) + list(vector_fields)
+            missing = None
+        else:
+            with_payload = list(RESERVED_PAYLOAD_FIELDS) + [f for f in fields if f in vector_fields]
+            missing = [f for f in fields if f not in vector_fields]
+        candidates = max(limit, mmr["fetch_k"]) if mmr else limit
+        store = self._get_vector_store(db)
+        try:
+            hits = await store.asearch(
+                collection_name, query_embedding, candidates * self._get_chunk_search_overfetch(db),
+                with_payload, query_filter
+            )
+            # The best chunk of each row is the one _collapse_chunks keeps
+            best_chunks = {}
+            for hit in hits if mmr else ():
+                best_chunks.setdefault((hit.get("payload") or {}).get("parent_id", hit["id"]), hit["id"])
+            hits = self._collapse_chunks(hits, candidates)
+            # Vectors are fetched in a second, payload-free request for the
+            # collapsed candidates only, which the store can parse off the loop
+            if mmr and hits:
+                vectors = await store.aretrieve_vectors(collection_name, [best_chunks[hit["id"]] for hit in hits])
+                for hit, vector in zip(hits, vectors):
+                    hit["vector"] = vector
+        except CollectionNotFound:
+            # Dropped since we cached it as existing
+            self._collections.pop(collection_name, None)
+            return []
+        if mmr:
+            hits = mmr_reranker.rerank(query_embedding, hits, limit, mmr["lambda_mult"])
+        if hits and (missing is None or missing):
+            hits = await run_in_threadpool(self._hydrate_payloads, hits, missing)
+        return hits
+
+    def _filter_conditions(self, query_filter: dict):
+        """Translate a SearchFilter dict into SQL conditions on the content buffer"""
+        conditions = []
+        if query_filter.get("source_ids") is not None:
+            conditions.append(RfyContentBuffer.source_id.in_(query_filter["source_ids"]))
+        for field, expected in (query_filter.get("match") or {}).items():
+            value = RfyContentBuffer.payload[field]
+            conditions.append(or_(*[
+                value.as_boolean() == e if isinstance(e, bool)
+                else value.as_float() == e if isinstance(e, (int, float))
+                else value.as_string() == e
+                for e in (expected if isinstance(expected, list) else [expected])
+            ]))
+        for field, bounds in (query_filter.get("range") or {}).items():
+            value = RfyContentBuffer.payload[field].as_float()
+            for op, bound in bounds.items():
+                conditions.append({"gt": value > bound, "gte": value >= bound, "lt": value < bound, "lte": value <= bound}[op])
+        return conditions
+
+    def _lexical_search(self, collection_name: str, query: str, limit: int, fields=None, query_filter: dict = None):
+        """BM25 search, hydrating hits with the same payload shape the vector store returns"""
+        db = SessionLocal()
+        try:
+            content_ids = None
+            if query_filter:
+                content_ids = select(RfyContentBuffer.id).where(
+                    RfyContentBuffer.collection_name == collection_name, *self._filter_conditions(query_filter)
+                )
+            scores = lexical_index_service.search(db, collection_name, query, limit, content_ids)
+            if not scores:
+                return []
+            rows = {
+                row.id: row for row in db.query(
+                    RfyContentBuffer.id, RfyContentBuffer.source_id,
+                    RfyContentBuffer.collection_name, RfyContentBuffer.payload
+                ).filter(RfyContentBuffer.id.in_([content_id for content_id, _ in scores]))
+            }
+            return [
+                {
+                    "id": content_id,
+                    "score": score,
+                    "payload": self._project_payload({
+                        "source_id": rows[content_id].source_id,
+                        "collection_name": rows[content_id].collection_name,
+                        **(rows[content_id].payload or {})
+                    }, fields)
+                }
+                for content_id, score in scores if content_id in rows
+            ]
+        finally:
+            db.close()
+
+    async def _alexical_search(self, collection_name: str, query: str, limit: int, fields=None, query_filter: dict = None):
+        """BM25 search on its own session, so it can run alongside the vector search"""
+        return await run_in_threadpool(self._lexical_search, collection_name, query, limit, fields, query_filter)
+
+    async def _avector_search(self, db: Session, collection_name: str, query: str, limit: int,
+                              fields=None, query_filter: dict = None, embedding=None, mmr: dict = None):
+        """Vector search, awaiting `embedding` (a task shared across collections) if given"""
+        query_embedding = await embedding if embedding is not None else await self._aembed_query(db, query)
+        return await self._asearch(db, collection_name, query_embedding, limit, fields, query_filter, mmr)
+
+    def _fuse_rankings(self, rankings: list, limit: int, k: int):
+        """Merge ranked hit lists with reciprocal rank fusion: score = sum of 1 / (k + rank)"""
+        fused = {}
+        for hits in rankings:
+            for rank, hit in enumerate(hits, start=1):
+                entry = fused.setdefault(hit["id"], {"id": hit["id"], "score": 0.0, "payload": hit["payload"]})
+                entry["score"] += 1.0 / (k + rank)
+        return sorted(fused.values(), key=lambda hit: hit["score"], reverse=True)[:limit]
+
+    async def _ahybrid_search(self, db: Session, collection_name: str, query: str, limit: int,
+                              fields=None, query_filter: dict = None, embedding=None, degraded: set = None):
+        """Run vector and BM25 search concurrently and fuse them; either side alone is a fallback.
+
+        A fallback adds `collection_name` to `degraded`, if given, so its results are not cached.
+        """
+        candidates = max(limit, self._get_hybrid_candidate_limit(db))
+        vector_hits, lexical_hits = await asyncio.gather(
+            self._avector_search(db, collection_name, query, candidates, fields, query_filter, embedding),
+            self._alexical_search(collection_name, query, candidates, fields, query_filter),
+            return_exceptions=True
+        )
+        if isinstance(vector_hits, HTTPException):
+            raise vector_hits
+        if isinstance(vector_hits, Exception) and isinstance(lexical_hits, Exception):
+            raise vector_hits
+        if isinstance(vector_hits, Exception):
+            print(f"Warning: Vector search failed, using lexical results only: {vector_hits}")
+            vector_hits = []
+            if degraded is not None:
+                degraded.add(collection_name)
+        if isinstance(lexical_hits, Exception):
+            print(f"Warning: Lexical search failed, using vector results only: {lexical_hits}")
+            lexical_hits = []
+            if degraded is not None:
+                degraded.add(collection_name)
+        return self._fuse_rankings([vector_hits, lexical_hits], limit, self._get_hybrid_rrf_k(db))
+
+    def _get_federated_normalization(self, db: Session):
+        """Get how per-collection lexical and hybrid scores are made comparable before merging ("minmax" or "none")"""
+        return self._get_setting(db, "federated_score_normalization", "minmax")
+
+    def _resolve_collections(self, db: Session, request):
+        """Get the collections a request targets, de-duplicated in order"""
+        names = request.collection_names or [request.collection_name or self._get_default_collection_name(db)]
+        return list(dict.fromkeys(names))
+
+    def _normalize_scores(self, hits: list, method: str):
+        """Rescale one collection's scores to 0..1 by its own min and max, so collections merge fairly.
+
+        A single hit or all-tied hits say nothing about where they stand, so
+        they get the neutral 0.5 rather than outranking every other collection.
+        """
+        if method != "minmax" or not hits:
+            return hits
+        scores = [hit["score"] for hit in hits]
+        low, high = min(scores), max(scores)
+        span = high - low
+        return [{**hit, "score": (hit["score"] - low) / span if span else 0.5} for hit in hits]
+
+    async def _asearch_collection(self, db: Session, collection_name: str, mode: str, query: str, limit: int,
+                                  fields=None, query_filter: dict = None, embedding=None, mmr: dict = None,
+                                  degraded: set = None):
+        """Search one collection in the given mode; MMR re-ranking applies to vector mode"""
+        if mode == "lexical":
+            return await self._alexical_search(collection_name, query, limit, fields, query_filter)
+        if mode == "hybrid":
+            return await self._ahybrid_search(
+                db, collection_name, query, limit, fields, query_filter, embedding, degraded
+            )
+        return await self._avector_search(db, collection_name, query, limit, fields, query_filter, embedding, mmr)
+
+    async def _asearch_collections(self, db: Session, collection_names: list, mode: str, query: str, limit: int,
+                                   fields_key: str, fields_default: str = "", query_filter: dict = None, embedding=None,
+                                   mmr: dict = None, degraded: set = None):
+        """Search several collections concurrently and merge them into one top-`limit`.
+
+        The query is embedded once and shared. Cosine scores from one embedding
+        model are already comparable, so vector mode merges them raw; BM25 and
+        RRF scores are per-collection, so lexical and hybrid results are normalized
+        first. A collection that fails is skipped unless they all do; skipped and
+        fallback collections are added to `degraded`, if given.
+        """
+        if mode != "lexical" and embedding is None:
+            embedding = asyncio.ensure_future(self._aembed_query(db, query))
+        results = await asyncio.gather(*(
+            self._asearch_collection(
+                db, name, mode, query, limit,
+                self._get_payload_fields(db, fields_key, name, fields_default), query_filter, embedding, mmr,
+                degraded
+            )
+            for name in collection_names
+        ), return_exceptions=True)
+        if len(results) == 1:
+            if isinstance(results[0], Exception):
+                raise results[0]
+            return results[0]
+        failures = [r for r in results if isinstance(r, Exception)]
+        # A rejected request is not a collection failure to skip
+        for failure in failures:
+            if isinstance(failure, HTTPException):
+                raise failure
+        if len(failures) == len(results):
+            raise failures[0]
+        method = self._get_federated_normalization(db) if mode != "vector" else "none"
+        merged = []
+        for name, hits in zip(collection_names, results):
+            if isinstance(hits, Exception):
+                print(f"Warning: Search in collection '{name}' failed, skipping it: {hits}")
+                if degraded is not None:
+                    degraded.add(name)
+                continue
+            merged.extend(self._normalize_scores(hits, method))
+        merged.sort(key=lambda hit: hit["score"], reverse=True)
+        return merged[:limit]
+
+    async def search_content(self, request: SearchRequest, db: Session):
+        """Search content by vector similarity, BM25, or both fused, across one or more collections"""
+        await self._ensure_settings_loaded(db)
+        collection_names = self._resolve_collections(db, request)
         limit = request.limit or 5
-        qdrant_client = self._get_qdrant_client(db)
-        ollama_url = self._get_ollama_url(db)
-        llama_model = self._get_llama_model(db)
+        mode = request.mode or "vector"
+        query_filter = request.filter.model_dump(exclude_none=True) if request.filter else None
+        mmr = request.mmr.model_dump() if request.mmr else None
+        degraded = set()
+        
+        # With the BM25 index off it is no longer kept up to date by syncs
+        if mode != "vector" and not self._lexical_index_enabled(db):
+            if mode == "lexical":
+                raise HTTPException(status_code=400, detail="Lexical search is disabled (lexical_index_enabled is false)")
+            print("Warning: Lexical index is disabled, running hybrid search as vector search")
+            mode = "vector"
+            degraded.update(collection_names)
         
         try:
-            resp = httpx.post(
-                f"{ollama_url}/api/embeddings",
-                json={"model": llama_model, "prompt": request.query},
-                timeout=60.0
+            generations = await self._aget_generations(db, collection_names)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Qdrant search failed: {e}")
+        
+        cache_key = None
+        if self._configure_search_cache(db) and not degraded:
+            # The generation changes whenever a sync or delete touches the
+            # collection, so entries from before it are simply never looked up again
+            cache_key = (
+                tuple(collection_names), tuple(generations[name] for name in collection_names), normalize_text(request.query), limit, mode,
+                json.dumps(query_filter, sort_keys=True) if query_filter else None,
+                (mmr["lambda_mult"], mmr["fetch_k"]) if mmr else None
             )
-            resp.raise_for_status()
-            query_embedding = resp.json()["embedding"]
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        await http_client_service.close_retired()
+        try:
+            # Check which collections exist
+            collection_names = await self._aexisting_collections(db, collection_names, generations)
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Embedding failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Qdrant search failed: {e}")
+        if not collection_names:
+            return {"results": []}
+        
+        embedding = None
+        if mode == "vector":
+            # Awaited here to report embedding errors apart from search errors
+            embedding = asyncio.ensure_future(self._aembed_query(db, request.query))
+            try:
+                await embedding
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Embedding failed: {e}")
         
         try:
-            # Qdrant search via REST API
-            host = self._get_setting(db, "qdrant_host", "qdrant")
-            port = int(self._get_setting(db, "qdrant_port", "6333"))
-            # Check if collection exists
-            check_resp = httpx.get(f"http://{host}:{port}/collections/{collection_name}", timeout=10.0)
-            if check_resp.status_code != 200:
-                return {"results": []}
-            resp = httpx.post(
-                f"http://{host}:{port}/collections/{collection_name}/points/search",
-                json={"vector": query_embedding, "limit": limit, "with_payload": True},
-                timeout=60.0
+            hits = await self._asearch_collections(
+                db, collection_names, mode, request.query, limit,
+                "payload_search_fields", query_filter=query_filter, embedding=embedding, mmr=mmr,
+                degraded=degraded
             )
-            resp.raise_for_status()
-            search_data = resp.json()
             results = []
-            for hit in search_data.get("result", []):
+            for hit in hits:
                 results.append({
                     "id": hit["id"],
                     "score": hit["score"],
                     "payload": hit["payload"]
                 })
-            return {"results": results}
+            response = {"results": results}
+            # Partial results from a fallback would otherwise be served until the next sync
+            if cache_key is not None and not degraded:
+                self._search_cache.put(cache_key, response)
+            return response
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Qdrant search failed: {e}")
 
     async def chat(self, request: ChatRequest, db: Session):
         """Chat with content context from Qdrant"""
-        collection_name = request.collection_name or self._get_default_collection_name(db)
+        await self._ensure_settings_loaded(db)
+        collection_names = self._resolve_collections(db, request)
+        collection_name = ", ".join(collection_names)
         ollama_url = self._get_ollama_url(db)
-        llama_model = self._get_llama_model(db)
+        context_stats = {"items": 0, "items_dropped": 0, "assembly_ms": 0.0}
+        started = time.perf_counter()
+        # Only answers grounded in a search that ran are worth replaying
+        existing = []
+        generations = {}
+        cacheable = False
 
         try:
-            # Check if collection exists first
-            host = self._get_setting(db, "qdrant_host", "qdrant")
-            port = int(self._get_setting(db, "qdrant_port", "6333"))
-            check_resp = httpx.get(f"http://{host}:{port}/collections/{collection_name}", timeout=10.0)
-            if check_resp.status_code != 200:
+            # Check if the collections exist first
+            generations = await self._aget_generations(db, collection_names)
+            existing = await self._aexisting_collections(db, collection_names, generations)
+            if not existing:
                 # Collection doesn't exist - return helpful error message
                 error_msg = f"Collection '{collection_name}' does not exist in Qdrant. Please sync your payloads first using the 'Sync to Qdrant' button in the Context Browser."
                 template = self._get_rag_context_search_failed(db)
                 rag_context = f"{template.format(prompt=request.prompt)}\n\nNote: {error_msg}"
             else:
-                # Generate embedding for the search query
-                resp = httpx.post(
-                    f"{ollama_url}/api/embeddings",
-                    json={"model": llama_model, "prompt": request.prompt},
-                    timeout=60.0
+                # Embed the search query once and search the collections in Qdrant
+                degraded = set()
+                search_result = await self._asearch_collections(
+                    db, existing, "vector", request.prompt, self._get_rag_context_max_items(db),
+                    "payload_chat_fields", '{"*": ["title", "url"]}',
+                    request.filter.model_dump(exclude_none=True) if request.filter else None,
+                    mmr=request.mmr.model_dump() if request.mmr else None, degraded=degraded
                 )
-                resp.raise_for_status()
-                query_embedding = resp.json()["embedding"]
-                
-                # Search in Qdrant via REST API
-                host = self._get_setting(db, "qdrant_host", "qdrant")
-                port = int(self._get_setting(db, "qdrant_port", "6333"))
-                resp = httpx.post(
-                    f"http://{host}:{port}/collections/{collection_name}/points/search",
-                    json={"vector": query_embedding, "limit": 5, "with_payload": True},
-                    timeout=60.0
-                )
-                resp.raise_for_status()
-                search_data = resp.json()
-                search_result = search_data.get("result", [])
 
                 # Log search results for debugging
                 # print(f"Chat search query: '{request.prompt}' in collection '{collection_name}'")
@@ -327,51 +1470,137 @@ class ContentService:
                 #         print(f"  Result {i+1}: score={score}, payload={payload}")
                 
                 if search_result:
-                    content_list = "\n".join([
-                        f"- {payload.get('title', 'No title')}: {payload.get('url', 'No url')}"
-                        for hit in search_result
-                        if (payload := hit.get('payload', {}))
-                    ])
-                    template = self._get_rag_context_template(db)
-                    rag_context = template.format(prompt=request.prompt, content_list=content_list)
-                else:
+                    rag_context, context_stats = context_builder.build(
+                        self._get_rag_context_template(db), request.prompt, search_result,
+                        self._get_rag_context_item_template(db), self._get_rag_context_token_budget(db)
+                    )
+                cacheable = not degraded
+                if not context_stats["items"]:
                     template = self._get_rag_context_no_results(db)
                     rag_context = template.format(prompt=request.prompt)
-                    print(f"Warning: No results found for query '{request.prompt}' in collection '{collection_name}'")
+                    if search_result:
+                        print(f"Warning: No results for query '{request.prompt}' fit the rag_context_token_budget")
+                    else:
+                        print(f"Warning: No results found for query '{request.prompt}' in collection '{collection_name}'")
         except HTTPException:
             raise
         except Exception as e:
             template = self._get_rag_context_search_failed(db)
             rag_context = template.format(prompt=request.prompt)
+            cacheable = False
+        retrieval_ms = (time.perf_counter() - started) * 1000 - context_stats["assembly_ms"]
+        # Reported so the prompt size behind time-to-first-token can be tuned
+        context_headers = {
+            "X-Prompt-Tokens": str(context_builder.estimate_tokens(rag_context)),
+            "X-Context-Items": str(context_stats["items"]),
+            "X-Context-Items-Dropped": str(context_stats["items_dropped"]),
+            "X-Context-Assembly-Ms": f"{context_stats['assembly_ms']:.3f}",
+            "X-Retrieval-Ms": f"{retrieval_ms:.1f}",
+        }
+        
+        from fastapi.responses import StreamingResponse
+        # Follow-up turns send Ollama the context it returned last turn, so the
+        # conversation so far is not processed again; retrieval used only this turn.
+        # Only clients that ask for a session get one
+        session = None
+        prior_context = None
+        if request.session_id and self._configure_chat_sessions(db):
+            session = chat_session_store.get_or_create(None if request.session_id == "new" else request.session_id)
+            prior_context = list(session.context) or None
+            context_headers["X-Chat-Session-Id"] = session.id
+        turn = {
+            "turn": len(session.turns) + 1 if session is not None else 1,
+            "context_tokens_in": len(prior_context or []),
+            "prompt_tokens_estimate": int(context_headers["X-Prompt-Tokens"]),
+        }
+        
+        answer_key = None
+        # The key doesn't cover conversation history, so only opening turns are cached
+        if cacheable and prior_context is None and self._configure_answer_cache(db):
+            # A sync or delete bumps the generation, so answers from before it are never replayed
+            answer_key = (
+                request.model,
+                hashlib.sha256(rag_context.encode("utf-8")).hexdigest(),
+                tuple((name, generations[name]) for name in existing)
+            )
+            cached = self._answer_cache.get(answer_key)
+            if cached is not None:
+                cached_body, cached_context = cached
+                if session is not None:
+                    chat_session_store.save_turn(session, cached_context, {
+                        **turn, "answer_cache": "hit", "ttft_ms": round((time.perf_counter() - started) * 1000, 1)
+                    })
+
+                async def replay_response():
+                    yield cached_body
+                return StreamingResponse(
+                    replay_response(), media_type="application/x-ndjson",
+                    headers={**context_headers, "X-Answer-Cache": "hit"}
+                )
+            context_headers["X-Answer-Cache"] = "miss"
         
         # Stream response from Ollama with RAG context
         try:
+            await http_client_service.close_retired()
+            ollama_http = self._get_async_http_client(db, ollama_url)
+
+            generate_body = {"model": request.model, "prompt": rag_context, "stream": True}
+            if prior_context:
+                generate_body["context"] = prior_context
+            keep_alive = self._get_ollama_keep_alive(db)
+            if keep_alive:
+                generate_body["keep_alive"] = keep_alive
+
             async def stream_response():
-                async with httpx.AsyncClient(timeout=None) as client:
-                    async with client.stream(
+                recorded = [] if answer_key is not None else None
+                generate_started = time.perf_counter()
+                first_token_at = None
+                # No timeout, so the grace period can't cover it: hold the client
+                # open even if new HTTP settings retire it mid-answer
+                with http_client_service.in_use(ollama_http):
+                    async with ollama_http.stream(
                         "POST",
-                        f"{ollama_url}/api/generate",
-                        json={"model": request.model, "prompt": rag_context, "stream": True},
+                        "/api/generate",
+                        json=generate_body,
+                        timeout=None,
                     ) as response:
                         response.raise_for_status()
-                        async for chunk in response.aiter_text():
-                            if chunk.strip():
+                        # Ollama sends one JSON object per line; text chunks may split or merge them
+                        async for line in response.aiter_lines():
+                            if line.strip():
                                 try:
-                                    # Parse the Ollama response chunk
-                                    data = json.loads(chunk)
+                                    # Parse the Ollama response line
+                                    data = json.loads(line)
                                     # Extract the response text
                                     if 'response' in data:
+                                        if first_token_at is None and data['response']:
+                                            first_token_at = time.perf_counter()
                                         # Format as JSON for frontend consumption
-                                        json_chunk = json.dumps({"response": data['response']}) + "\n"
-                                        yield json_chunk.encode('utf-8')
+                                        json_chunk = (json.dumps({"response": data['response']}) + "\n").encode('utf-8')
+                                        if recorded is not None:
+                                            recorded.append(json_chunk)
+                                        yield json_chunk
                                     # Check if streaming is done
                                     if data.get('done', False):
+                                        # Only complete answers are cached
+                                        if recorded is not None:
+                                            self._answer_cache.put(answer_key, (b"".join(recorded), data.get('context')))
+                                        if session is not None:
+                                            first_token_at = first_token_at or time.perf_counter()
+                                            chat_session_store.save_turn(session, data.get('context'), {
+                                                **turn,
+                                                "answer_cache": "miss" if answer_key is not None else None,
+                                                "ttft_ms": round((first_token_at - started) * 1000, 1),
+                                                "generate_ttft_ms": round((first_token_at - generate_started) * 1000, 1),
+                                                "prompt_eval_count": data.get('prompt_eval_count'),
+                                                "prompt_eval_ms": round(data.get('prompt_eval_duration', 0) / 1e6, 1),
+                                                "load_ms": round(data.get('load_duration', 0) / 1e6, 1),
+                                            })
                                         break
                                 except json.JSONDecodeError:
-                                    # Skip malformed JSON chunks
+                                    # Skip malformed JSON lines
                                     continue
-            from fastapi.responses import StreamingResponse
-            return StreamingResponse(stream_response(), media_type="application/x-ndjson")
+            return StreamingResponse(stream_response(), media_type="application/x-ndjson", headers=context_headers)
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=e.response.status_code, detail=str(e))
         except Exception as e:
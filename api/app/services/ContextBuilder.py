@@ -0,0 +1,54 @@
+import re
+import time
+
+
+PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+class _MissingFields(dict):
+    """Format map that renders absent payload fields as "No <field>" """
+
+    def __missing__(self, key):
+        return f"No {key}"
+
+
+class ContextBuilder:
+    """Fills the RAG template with search hits, best first, up to a token budget"""
+
+    def estimate_tokens(self, text: str):
+        """Approximate the LLM token count: one per punctuation mark, one per 4 characters of a word"""
+        return sum(1 + (len(piece) - 1) // 4 for piece in PIECE_RE.findall(text))
+
+    def build(self, template: str, prompt: str, hits: list, item_template: str, token_budget: int = 0):
+        """Return (rag_context, stats) with as many hits as fit in `token_budget` (0 for no limit).
+
+        Each hit's payload is rendered through `item_template`; hits that would
+        overflow the budget are skipped so smaller, lower-scored ones can still fit.
+        """
+        started = time.perf_counter()
+        used = self.estimate_tokens(template.format(prompt=prompt, content_list=""))
+        lines = []
+        dropped = 0
+        for hit in sorted(hits, key=lambda hit: hit.get("score", 0), reverse=True):
+            payload = hit.get("payload")
+            if not payload:
+                continue
+            line = item_template.format_map(_MissingFields(payload))
+            # The joining newline costs a token too
+            cost = self.estimate_tokens(line) + 1
+            if token_budget and used + cost > token_budget:
+                dropped += 1
+                continue
+            lines.append(line)
+            used += cost
+        rag_context = template.format(prompt=prompt, content_list="\n".join(lines))
+        return rag_context, {
+            "prompt_tokens": self.estimate_tokens(rag_context),
+            "items": len(lines),
+            "items_dropped": dropped,
+            "assembly_ms": (time.perf_counter() - started) * 1000,
+        }
+
+
+# Create a global instance of the builder
+context_builder = ContextBuilder()
@@ -0,0 +1,230 @@
+import fcntl
+import glob
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+
+
+def normalize_text(text: str):
+    """Canonical form of a text for cache keys: NFC, collapsed whitespace"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, text: str):
+    """32-byte digest identifying the embedding of `text` under `model`"""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).digest()
+
+
+class DiskEmbeddingStore:
+    """Set-associative embedding store on two memory-mapped files.
+
+    `<base>.vectors` holds `capacity` float32 rows of `dim` values. `<base>.index`
+    holds, per slot, the 32-byte key as four uint64 words plus a last-used stamp.
+    A key can only live in the `WAYS` slots of its bucket; inserting into a full
+    bucket evicts its least recently used slot. Writers serialise on a flock, and
+    readers verify the slot key before and after copying a vector, so several
+    processes can share the files without a separate index to keep consistent.
+    """
+
+    WAYS = 8
+
+    def __init__(self, base_path: str, dim: int, capacity: int):
+        self.dim = dim
+        self.capacity = max(self.WAYS, capacity - capacity % self.WAYS)
+        self._buckets = self.capacity // self.WAYS
+        self._lock_path = f"{base_path}.lock"
+        vectors_path = f"{base_path}.vectors"
+        index_path = f"{base_path}.index"
+
+        with self._file_lock():
+            expected = (self.capacity * dim * 4, self.capacity * 5 * 8)
+            existing = tuple(os.path.getsize(p) if os.path.exists(p) else -1 for p in (vectors_path, index_path))
+            if existing != expected:
+                # New (or never fully created) store: start empty
+                for path, size in zip((vectors_path, index_path), expected):
+                    with open(path, "wb") as f:
+                        f.truncate(size)
+            self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, dim))
+            self._index = np.memmap(index_path, dtype=np.uint64, mode="r+", shape=(self.capacity, 5))
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _slots(self, key_words):
+        start = int(key_words[0] % self._buckets) * self.WAYS
+        return range(start, start + self.WAYS)
+
+    def get(self, key: bytes):
+        words = np.frombuffer(key, dtype=np.uint64)
+        for slot in self._slots(words):
+            if np.array_equal(self._index[slot, :4], words):
+                vector = np.array(self._vectors[slot])
+                # A concurrent writer may have replaced the slot while we copied it
+                if np.array_equal(self._index[slot, :4], words):
+                    self._index[slot, 4] = time.time_ns()
+                    return vector
+                return None
+        return None
+
+    def put_many(self, entries):
+        """Store (key, vector) pairs, returning the number of evicted entries"""
+        evicted = 0
+        with self._file_lock():
+            for key, vector in entries:
+                words = np.frombuffer(key, dtype=np.uint64)
+                slots = self._slots(words)
+                target = None
+                for slot in slots:
+                    if np.array_equal(self._index[slot, :4], words):
+                        target = slot
+                        break
+                if target is None:
+                    stamps = self._index[slots.start:slots.stop, 4]
+                    target = slots.start + int(np.argmin(stamps))
+                    if stamps[target - slots.start] != 0:
+                        evicted += 1
+                # Clear the key first so readers never pair it with a half-written vector
+                self._index[target, :4] = 0
+                self._vectors[target] = vector
+                self._index[target, 4] = time.time_ns()
+                self._index[target, :4] = words
+        return evicted
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: an in-process LRU over a shared on-disk store"""
+
+    def __init__(self, directory: str = None):
+        self._directory = directory or os.getenv("EMBEDDING_CACHE_DIR", "/app/data/embedding_cache")
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_items = 2000
+        self._disk_items = 100000
+        # Set when the disk store can't be opened; configure() leaves it set, so
+        # a broken directory isn't retried and warned about on every settings reload
+        self._disk_failed = False
+        self._enabled = True
+        self._stores = {}
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+
+    def configure(self, enabled: bool = True, memory_items: int = 2000, disk_items: int = 100000):
+        """Apply size limits; a changed disk size starts a fresh disk store"""
+        with self._lock:
+            self._enabled = enabled
+            self._memory_items = max(0, memory_items)
+            if disk_items != self._disk_items:
+                self._disk_items = disk_items
+                self._stores.clear()
+            while len(self._memory) > self._memory_items:
+                self._memory.popitem(last=False)
+
+    def _store_prefix(self, model: str):
+        return os.path.join(self._directory, hashlib.sha1(model.encode("utf-8")).hexdigest()[:16])
+
+    def _get_store(self, model: str, dim: int = None):
+        """Open the disk store for a model; without `dim`, only an existing one"""
+        if self._disk_items <= 0 or self._disk_failed:
+            return None
+        store = self._stores.get(model)
+        if store is not None and (dim is None or store.dim == dim):
+            return store
+        prefix = self._store_prefix(model)
+        # Capacity is part of the file name so a resized store never truncates
+        # files another process still has mapped
+        suffix = f"_{self._disk_items}"
+        if dim is None:
+            existing = sorted(glob.glob(f"{prefix}_*{suffix}.index"), key=os.path.getmtime)
+            if not existing:
+                return None
+            dim = int(existing[-1][len(prefix) + 1:-len(f"{suffix}.index")])
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            store = DiskEmbeddingStore(f"{prefix}_{dim}{suffix}", dim, self._disk_items)
+        except OSError as e:
+            print(f"Warning: Embedding disk cache unavailable, using memory only: {e}")
+            self._disk_failed = True
+            return None
+        self._stores[model] = store
+        return store
+
+    def get_many(self, model: str, texts: list):
+        """Look up texts, returning a list with a vector (list of floats) or None per text"""
+        results = [None] * len(texts)
+        if not self._enabled:
+            return results
+        keys = [cache_key(model, text) for text in texts]
+        with self._lock:
+            store = None
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    results[i] = vector.tolist()
+                    continue
+                if store is None:
+                    store = self._get_store(model) or False
+                vector = store.get(key) if store else None
+                if vector is not None:
+                    self._counters["disk_hits"] += 1
+                    self._remember(key, vector)
+                    results[i] = vector.tolist()
+                else:
+                    self._counters["misses"] += 1
+        return results
+
+    def put_many(self, model: str, texts: list, vectors: list):
+        """Store freshly computed embeddings in both tiers"""
+        if not self._enabled or not texts:
+            return
+        entries = [
+            (cache_key(model, text), np.asarray(vector, dtype=np.float32))
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, vector)
+            store = self._get_store(model, dim=len(entries[0][1]))
+        if store:
+            evicted = store.put_many(entries)
+            with self._lock:
+                self._counters["disk_evictions"] += evicted
+
+    def _remember(self, key: bytes, vector):
+        if self._memory_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+                "memory_items": len(self._memory),
+                "memory_capacity": self._memory_items,
+                "disk_capacity": self._disk_items,
+                "disk_failed": self._disk_failed,
+                "enabled": self._enabled,
+            }
+
+
+# Create a global instance of the cache
+embedding_cache = EmbeddingCache()
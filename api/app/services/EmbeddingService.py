@@ -0,0 +1,192 @@
+import asyncio
+import time
+import httpx
+from app.services.HttpClientService import http_client_service
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from app.services.EmbeddingCache import embedding_cache
+from app.services.QueryEmbeddingBatcher import QueryEmbeddingBatcher
+
+
+class EmbeddingBatchResult:
+    """Outcome of one embedding batch: embedded items, failed items and latency"""
+
+    def __init__(self, items, embeddings, failed, latency, cached=0):
+        self.items = items
+        self.embeddings = embeddings
+        self.failed = failed
+        self.latency = latency
+        self.cached = cached
+
+
+class EmbeddingStats:
+    """Throughput and per-batch latency accumulated over an embedding run"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.rows_embedded = 0
+        self.rows_failed = 0
+        self.rows_cached = 0
+        self.batch_latencies = []
+
+    def record(self, result: EmbeddingBatchResult):
+        self.rows_embedded += len(result.items)
+        self.rows_failed += len(result.failed)
+        self.rows_cached += result.cached
+        self.batch_latencies.append(result.latency)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started_at
+        latencies = sorted(self.batch_latencies)
+        summary = {
+            "rows_embedded": self.rows_embedded,
+            "rows_failed": self.rows_failed,
+            "rows_cached": self.rows_cached,
+            "batches": len(latencies),
+            "elapsed_sec": round(elapsed, 3),
+            "rows_per_sec": round(self.rows_embedded / elapsed, 2) if elapsed > 0 else 0.0,
+            "batch_latency_ms": None,
+        }
+        if latencies:
+            summary["batch_latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 2),
+                "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2),
+            }
+        return summary
+
+
+class EmbeddingService:
+    """Batched embedding client for Ollama's /api/embed endpoint"""
+
+    def __init__(self):
+        self.query_batcher = QueryEmbeddingBatcher(self.aembed_texts)
+
+    def configure_query_batching(self, window_ms: float = 5.0, max_items: int = 32):
+        """Set how long and for how many queries concurrent query embeddings are coalesced"""
+        self.query_batcher.configure(window_ms, max_items)
+
+    def embed_texts(self, ollama_url: str, model: str, texts: list):
+        """Embed a list of texts with a single /api/embed request"""
+        client = http_client_service.get_client(ollama_url)
+        resp = client.post("/api/embed", json={"model": model, "input": texts}, timeout=120.0)
+        resp.raise_for_status()
+        embeddings = resp.json()["embeddings"]
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        return embeddings
+
+    async def aembed_texts(self, ollama_url: str, model: str, texts: list):
+        """Embed a list of texts with a single non-blocking /api/embed request"""
+        client = http_client_service.get_async_client(ollama_url)
+        resp = await client.post("/api/embed", json={"model": model, "input": texts}, timeout=120.0)
+        resp.raise_for_status()
+        embeddings = resp.json()["embeddings"]
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        return embeddings
+
+    async def aembed_query(self, ollama_url: str, model: str, text: str):
+        """Embed a single query text without blocking the event loop"""
+        # The disk tier takes a file lock and reads from disk, so keep it off the event loop
+        cached = (await asyncio.to_thread(embedding_cache.get_many, model, [text]))[0]
+        if cached is not None:
+            return cached
+        embedding = await self.query_batcher.embed(ollama_url, model, text)
+        await asyncio.to_thread(embedding_cache.put_many, model, [text], [embedding])
+        return embedding
+
+    def _embed_batch(self, ollama_url: str, model: str, items: list, max_retries: int):
+        """Embed one batch of (key, text) items, serving what it can from the cache"""
+        started = time.perf_counter()
+        cached = embedding_cache.get_many(model, [text for _, text in items])
+        hits = [(item, vector) for item, vector in zip(items, cached) if vector is not None]
+        misses = [item for item, vector in zip(items, cached) if vector is None]
+        result = EmbeddingBatchResult([item for item, _ in hits], [vector for _, vector in hits], [], 0.0, len(hits))
+        if misses:
+            embedded = self._embed_uncached(ollama_url, model, misses, max_retries)
+            embedding_cache.put_many(model, [text for _, text in embedded.items], embedded.embeddings)
+            result.items += embedded.items
+            result.embeddings += embedded.embeddings
+            result.failed = embedded.failed
+        result.latency = time.perf_counter() - started
+        return result
+
+    def _embed_uncached(self, ollama_url: str, model: str, items: list, max_retries: int):
+        """Embed one batch of (key, text) items with Ollama, retrying and splitting on failure"""
+        started = time.perf_counter()
+        texts = [text for _, text in items]
+        last_error = None
+        for attempt in range(max_retries + 1):
+            try:
+                embeddings = self.embed_texts(ollama_url, model, texts)
+                return EmbeddingBatchResult(items, embeddings, [], time.perf_counter() - started)
+            except httpx.HTTPStatusError as e:
+                last_error = e
+                if e.response.status_code < 500:
+                    # The input itself was rejected; retrying it unchanged won't help
+                    break
+                if attempt < max_retries:
+                    time.sleep(min(0.5 * (2 ** attempt), 8.0))
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries:
+                    time.sleep(min(0.5 * (2 ** attempt), 8.0))
+
+        # Isolate rows the server keeps rejecting by splitting the batch
+        if len(items) > 1 and isinstance(last_error, httpx.HTTPStatusError):
+            middle = len(items) // 2
+            left = self._embed_uncached(ollama_url, model, items[:middle], max_retries)
+            right = self._embed_uncached(ollama_url, model, items[middle:], max_retries)
+            return EmbeddingBatchResult(
+                left.items + right.items,
+                left.embeddings + right.embeddings,
+                left.failed + right.failed,
+                time.perf_counter() - started,
+            )
+
+        print(f"Failed to generate embeddings for {len(items)} item(s): {last_error}")
+        return EmbeddingBatchResult([], [], [key for key, _ in items], time.perf_counter() - started)
+
+    def embed_stream(self, ollama_url: str, model: str, items, batch_size: int = 32,
+                     concurrency: int = 4, max_retries: int = 3, stats: EmbeddingStats = None):
+        """Embed an iterable of (key, text) items, yielding an EmbeddingBatchResult per batch.
+
+        Up to `concurrency` batches are kept in flight; results are yielded as they
+        complete so callers can upsert while later batches are still embedding.
+        """
+        batch_size = max(1, batch_size)
+        concurrency = max(1, concurrency)
+
+        def batches():
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = set()
+            for batch in batches():
+                pending.add(executor.submit(
+                    self._embed_batch, ollama_url, model, batch, max_retries
+                ))
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        if stats is not None:
+                            stats.record(result)
+                        yield result
+            for future in pending:
+                result = future.result()
+                if stats is not None:
+                    stats.record(result)
+                yield result
+
+
+# Create a global instance of the service
+embedding_service = EmbeddingService()
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Replaced clients are closed once requests already using them have had time to
+# finish; requests without a timeout hold their client with in_use() instead
+RETIRED_CLIENT_GRACE = 60.0
+
+
+class HttpClientService:
+    """Long-lived pooled HTTP clients for Ollama and Qdrant, one per base URL"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._async_clients = {}
+        self._retired = []
+        # Client -> number of unbounded requests (streams) still using it
+        self._in_use = {}
+        # Pending aclose() tasks of expired async clients, kept so they aren't garbage collected
+        self._closing = set()
+        self._config = {
+            "max_connections": 100,
+            "max_keepalive_connections": 20,
+            "keepalive_expiry": 30.0,
+            "http2": True,
+        }
+
+    def configure(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                  keepalive_expiry: float = 30.0, http2: bool = True):
+        """Set pool limits; existing clients are rebuilt if they changed"""
+        config = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+            "http2": http2,
+        }
+        if config != self._config:
+            self._config = config
+            self.reset()
+
+    def _client_kwargs(self, base_url: str):
+        return {
+            "base_url": base_url,
+            "timeout": httpx.Timeout(60.0, connect=10.0),
+            "limits": httpx.Limits(
+                max_connections=self._config["max_connections"],
+                max_keepalive_connections=self._config["max_keepalive_connections"],
+                keepalive_expiry=self._config["keepalive_expiry"],
+            ),
+            # HTTP/2 is only negotiated over TLS; plain http:// stays on HTTP/1.1
+            "http2": self._config["http2"] and HTTP2_AVAILABLE,
+        }
+
+    def get_client(self, base_url: str):
+        """Get the shared synchronous client for a base URL"""
+        client = self._clients.get(base_url)
+        if client is not None:
+            return client
+        with self._lock:
+            self._close_expired()
+            client = self._clients.get(base_url)
+            if client is None:
+                client = httpx.Client(**self._client_kwargs(base_url))
+                self._clients[base_url] = client
+            return client
+
+    def get_async_client(self, base_url: str):
+        """Get the shared async client for a base URL"""
+        client = self._async_clients.get(base_url)
+        if client is not None:
+            return client
+        with self._lock:
+            self._close_expired_async()
+            client = self._async_clients.get(base_url)
+            if client is None:
+                client = httpx.AsyncClient(**self._client_kwargs(base_url))
+                self._async_clients[base_url] = client
+            return client
+
+    @contextmanager
+    def in_use(self, client):
+        """Keep a retired client open while a request without a timeout, like a stream, still uses it"""
+        with self._lock:
+            self._in_use[client] = self._in_use.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_use[client] -= 1
+                if not self._in_use[client]:
+                    del self._in_use[client]
+
+    def reset(self):
+        """Retire all clients so the next request builds new ones from current settings"""
+        with self._lock:
+            retired_at = time.monotonic()
+            for client in list(self._clients.values()) + list(self._async_clients.values()):
+                self._retired.append((retired_at, client))
+            self._clients = {}
+            self._async_clients = {}
+
+    def _close_expired(self):
+        """Close synchronous clients retired longer than the grace period"""
+        now = time.monotonic()
+        keep = []
+        for retired_at, client in self._retired:
+            if isinstance(client, httpx.Client) and now - retired_at > RETIRED_CLIENT_GRACE and client not in self._in_use:
+                client.close()
+            else:
+                keep.append((retired_at, client))
+        self._retired = keep
+
+    def _take_expired_async(self):
+        """Remove and return async clients retired longer than the grace period; call with the lock held"""
+        now = time.monotonic()
+        expired = [
+            c for t, c in self._retired
+            if isinstance(c, httpx.AsyncClient) and now - t > RETIRED_CLIENT_GRACE and c not in self._in_use
+        ]
+        self._retired = [(t, c) for t, c in self._retired if c not in expired]
+        return expired
+
+    def _close_expired_async(self):
+        """Schedule closing expired async clients on the running event loop, if there is one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on a loop; close_retired() or shutdown() will close them
+            return
+        for client in self._take_expired_async():
+            task = loop.create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def close_retired(self):
+        """Close async clients retired longer than the grace period"""
+        with self._lock:
+            expired = self._take_expired_async()
+        for client in expired:
+            await client.aclose()
+
+    async def shutdown(self):
+        """Close every client"""
+        self.reset()
+        with self._lock:
+            retired = [client for _, client in self._retired]
+            self._retired = []
+        for client in retired:
+            if isinstance(client, httpx.AsyncClient):
+                await client.aclose()
+            else:
+                client.close()
+
+
+# Create a global instance of the service
+http_client_service = HttpClientService()
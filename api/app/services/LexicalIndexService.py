@@ -0,0 +1,111 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from sqlalchemy import case, func, literal
+from sqlalchemy.orm import Session
+from app.models.rfy_lexical_index import RfyLexicalDocument, RfyLexicalPosting
+
+
+TOKEN_RE = re.compile(r"\w+(?:[-./]\w+)*")
+SPLIT_RE = re.compile(r"[-./]")
+MAX_TERM_LENGTH = 64
+
+
+def tokenize(text: str):
+    """Lowercased, accent-folded tokens; compound tokens like SKUs also yield their parts"""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    tokens = []
+    for token in TOKEN_RE.findall(folded):
+        tokens.append(token)
+        if SPLIT_RE.search(token):
+            tokens.extend(part for part in SPLIT_RE.split(token) if part)
+    return [token for token in tokens if len(token) <= MAX_TERM_LENGTH]
+
+
+class LexicalIndexService:
+    """Incremental BM25 inverted index over the text each buffer row is embedded from"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    def index_documents(self, db: Session, documents: list):
+        """Replace the postings of (content_id, collection_name, text) documents; the caller commits"""
+        if not documents:
+            return
+        content_ids = [content_id for content_id, _, _ in documents]
+        self.remove_documents(db, content_ids)
+        doc_rows = []
+        posting_rows = []
+        for content_id, collection_name, text in documents:
+            counts = Counter(tokenize(text))
+            doc_rows.append({"content_id": content_id, "collection_name": collection_name, "length": sum(counts.values())})
+            posting_rows.extend(
+                {"content_id": content_id, "term": term, "collection_name": collection_name, "tf": tf}
+                for term, tf in counts.items()
+            )
+        db.execute(RfyLexicalDocument.__table__.insert(), doc_rows)
+        if posting_rows:
+            db.execute(RfyLexicalPosting.__table__.insert(), posting_rows)
+
+    def remove_documents(self, db: Session, content_ids: list):
+        """Drop documents from the index; the caller commits"""
+        if not content_ids:
+            return
+        db.query(RfyLexicalPosting).filter(RfyLexicalPosting.content_id.in_(content_ids)).delete(synchronize_session=False)
+        db.query(RfyLexicalDocument).filter(RfyLexicalDocument.content_id.in_(content_ids)).delete(synchronize_session=False)
+
+    def search(self, db: Session, collection_name: str, query: str, limit: int, content_ids=None):
+        """Return up to `limit` (content_id, bm25_score) pairs, best first.
+
+        `content_ids` (ids or a subquery of them) restricts the documents scored;
+        corpus statistics still come from the whole collection.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        doc_count, avg_length = db.query(
+            func.count(RfyLexicalDocument.content_id), func.avg(RfyLexicalDocument.length)
+        ).filter(RfyLexicalDocument.collection_name == collection_name).one()
+        if not doc_count:
+            return []
+        avg_length = float(avg_length) or 1.0
+        doc_freqs = dict(
+            db.query(RfyLexicalPosting.term, func.count(RfyLexicalPosting.content_id))
+            .filter(RfyLexicalPosting.collection_name == collection_name, RfyLexicalPosting.term.in_(terms))
+            .group_by(RfyLexicalPosting.term)
+            .all()
+        )
+        if not doc_freqs:
+            return []
+        idf = case(
+            *[
+                (RfyLexicalPosting.term == term, literal(math.log(1 + (doc_count - df + 0.5) / (df + 0.5))))
+                for term, df in doc_freqs.items()
+            ],
+            else_=literal(0.0)
+        )
+        # Score in the database so only the top `limit` rows come back
+        norm = self.k1 * (1 - self.b + self.b * RfyLexicalDocument.length / avg_length)
+        score = func.sum(idf * RfyLexicalPosting.tf * (self.k1 + 1) / (RfyLexicalPosting.tf + norm)).label("score")
+        scored = (
+            db.query(RfyLexicalPosting.content_id, score)
+            .join(RfyLexicalDocument, RfyLexicalDocument.content_id == RfyLexicalPosting.content_id)
+            .filter(RfyLexicalPosting.collection_name == collection_name, RfyLexicalPosting.term.in_(list(doc_freqs)))
+        )
+        if content_ids is not None:
+            scored = scored.filter(RfyLexicalPosting.content_id.in_(content_ids))
+        rows = (
+            scored
+            .group_by(RfyLexicalPosting.content_id)
+            .order_by(score.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(content_id, float(score)) for content_id, score in rows]
+
+
+# Create a global instance of the service
+lexical_index_service = LexicalIndexService()
@@ -0,0 +1,45 @@
+import numpy as np
+
+
+class MmrReranker:
+    """Maximal marginal relevance: trade a hit's relevance against its similarity to hits already picked"""
+
+    def select(self, query_vector: list, vectors, k: int, lambda_mult: float = 0.5):
+        """Return the indices of `k` vectors (a matrix, or a list of lists or arrays) picked greedily by MMR, in pick order.
+
+        Only the similarity rows of picked vectors are computed, k matrix-vector
+        products rather than the full n x n matrix.
+        """
+        n = len(vectors)
+        if n == 0 or k <= 0:
+            return []
+        # One conversion, and none at all for a float32 matrix
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.maximum(np.linalg.norm(matrix, axis=1), 1e-12)
+        query = np.asarray(query_vector, dtype=np.float32)
+        relevance = (matrix @ query) / (norms * max(float(np.linalg.norm(query)), 1e-12))
+        picked = [int(np.argmax(relevance))]
+        # Similarity of every candidate to its closest already-picked hit
+        redundancy = (matrix @ matrix[picked[0]]) / (norms * norms[picked[0]])
+        available = np.ones(n, dtype=bool)
+        available[picked[0]] = False
+        for _ in range(min(k, n) - 1):
+            scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            picked.append(best)
+            available[best] = False
+            np.maximum(redundancy, (matrix @ matrix[best]) / (norms * norms[best]), out=redundancy)
+        return picked
+
+    def rerank(self, query_vector: list, hits: list, k: int, lambda_mult: float = 0.5):
+        """Pick a diverse top-`k` of hits carrying a "vector"; the vectors are dropped from the result"""
+        with_vectors = [hit for hit in hits if hit.get("vector") is not None]
+        if not with_vectors:
+            return []
+        picked = self.select(query_vector, np.stack([hit["vector"] for hit in with_vectors], dtype=np.float32), k, lambda_mult)
+        return [{key: v for key, v in with_vectors[i].items() if key != "vector"} for i in picked]
+
+
+# Create a global instance of the reranker
+mmr_reranker = MmrReranker()
@@ -0,0 +1,278 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+import numpy as np
+from app.services.VectorStore import VectorStore, CollectionNotFound, matches_filter
+
+
+class NumpyCollection:
+    """One collection: unit-normalized float32 rows in a memory-mapped file plus a points log.
+
+    `vectors.f32` holds one row per point ever written. `points.log` is an
+    append-only NDJSON log of upserts (id, row, payload) and deletes; replaying it
+    gives the id -> row map and payloads. Writers serialise on a flock and write a
+    vector before logging it, so other processes only need to replay the log
+    tail they haven't seen to catch up. Rows of deleted points are not reused;
+    recreating the collection reclaims them.
+    """
+
+    MIN_ROWS = 1024
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.dim = None
+        self._log_inode = None
+        self._log_offset = 0
+        self._rows = {}
+        self._ids = []
+        self._payloads = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._vectors = None
+
+    def _file(self, name: str):
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._file(".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def create(self, dim: int):
+        os.makedirs(self.path, exist_ok=True)
+        with self._file_lock():
+            for name in ("vectors.f32", "points.log", "meta.json"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+            # New files get new inodes, which is how other processes notice the recreate
+            open(self._file("vectors.f32"), "wb").close()
+            open(self._file("points.log"), "wb").close()
+            with open(self._file("meta.json"), "w") as f:
+                json.dump({"dim": dim}, f)
+        with self._lock:
+            self._reset()
+
+    def exists(self):
+        return os.path.exists(self._file("meta.json")) and os.path.exists(self._file("points.log"))
+
+    def refresh(self):
+        """Catch up with writes made through other instances or processes"""
+        with self._lock:
+            try:
+                stat = os.stat(self._file("points.log"))
+            except FileNotFoundError:
+                raise CollectionNotFound(self.path)
+            if stat.st_ino != self._log_inode:
+                self._reset()
+                with open(self._file("meta.json")) as f:
+                    self.dim = json.load(f)["dim"]
+                self._log_inode = stat.st_ino
+            if stat.st_size <= self._log_offset:
+                return
+            with open(self._file("points.log"), "rb") as f:
+                f.seek(self._log_offset)
+                tail = f.read(stat.st_size - self._log_offset)
+            # Only apply complete lines; a writer may be mid-append
+            complete = tail[:tail.rfind(b"\n") + 1]
+            self._log_offset += len(complete)
+            for line in complete.splitlines():
+                self._apply(json.loads(line))
+            self._map_vectors(len(self._ids))
+
+    def _apply(self, record: dict):
+        point_id = record["id"]
+        if record["op"] == "delete":
+            row = self._rows.pop(point_id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._payloads[row] = None
+            return
+        row = record["row"]
+        old_row = self._rows.get(point_id)
+        if old_row is not None and old_row != row:
+            self._alive[old_row] = False
+            self._payloads[old_row] = None
+        while len(self._ids) <= row:
+            self._ids.append(None)
+            self._payloads.append(None)
+        if len(self._alive) < len(self._ids):
+            alive = np.zeros(max(len(self._ids), len(self._alive) * 2), dtype=bool)
+            alive[:len(self._alive)] = self._alive
+            self._alive = alive
+        self._rows[point_id] = row
+        self._ids[row] = point_id
+        self._payloads[row] = record.get("payload")
+        self._alive[row] = True
+
+    def _map_vectors(self, rows: int):
+        """(Re)map the vectors file if it has grown past the current mapping"""
+        if self._vectors is not None and len(self._vectors) >= rows:
+            return
+        capacity = os.path.getsize(self._file("vectors.f32")) // (self.dim * 4)
+        self._vectors = (
+            np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+            if capacity else None
+        )
+
+    def upsert(self, points: list):
+        with self._file_lock():
+            self.refresh()
+            with self._lock:
+                next_row = len(self._ids)
+                records = []
+                rows = []
+                for point in points:
+                    row = self._rows.get(point["id"])
+                    if row is None:
+                        row = next_row
+                        next_row += 1
+                    records.append({"op": "upsert", "id": point["id"], "row": row, "payload": point["payload"]})
+                    rows.append(row)
+                if not records:
+                    return
+                capacity = len(self._vectors) if self._vectors is not None else 0
+                if next_row > capacity:
+                    capacity = max(next_row, capacity * 2, self.MIN_ROWS)
+                    with open(self._file("vectors.f32"), "r+b") as f:
+                        f.truncate(capacity * self.dim * 4)
+                    self._map_vectors(capacity)
+                matrix = np.asarray([point["vector"] for point in points], dtype=np.float32)
+                if matrix.shape[1] != self.dim:
+                    raise ValueError(f"Expected vectors of size {self.dim}, got {matrix.shape[1]}")
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._vectors[rows] = matrix / np.where(norms == 0, 1, norms)
+                self._vectors.flush()
+            with open(self._file("points.log"), "ab") as f:
+                f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8"))
+            self.refresh()
+
+    def delete(self, ids: list):
+        with self._file_lock():
+            self.refresh()
+            records = [{"op": "delete", "id": point_id} for point_id in ids if point_id in self._rows]
+            if records:
+                with open(self._file("points.log"), "ab") as f:
+                    f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8"))
+            self.refresh()
+
+    def count(self):
+        self.refresh()
+        return len(self._rows)
+
+    def search(self, vector: list, limit: int, with_payload=True, query_filter: dict = None, with_vectors: bool = False):
+        self.refresh()
+        with self._lock:
+            rows = len(self._ids)
+            vectors, alive, ids, payloads = self._vectors, self._alive[:rows], self._ids, self._payloads
+            live = len(self._rows)
+            if query_filter:
+                # No payload indexes here: scan the payloads, then rank only the matches
+                alive = alive & np.fromiter(
+                    (matches_filter(payloads[row] or {}, query_filter) if alive[row] else False for row in range(rows)),
+                    dtype=bool, count=rows
+                )
+                live = int(alive.sum())
+        if not live or limit <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = vectors[:rows] @ query
+        scores[~alive] = -np.inf
+        k = min(limit, live)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        hits = []
+        for row in top:
+            payload = payloads[row]
+            if with_payload is not True:
+                payload = {k: v for k, v in (payload or {}).items() if k in with_payload}
+            hit = {"id": ids[row], "score": float(scores[row]), "payload": payload}
+            if with_vectors:
+                # float32 arrays rather than lists, so re-ranking skips a conversion
+                hit["vector"] = np.array(vectors[row])
+            hits.append(hit)
+        return hits
+
+
+    def retrieve_vectors(self, ids: list):
+        self.refresh()
+        with self._lock:
+            rows = [self._rows.get(point_id) for point_id in ids]
+            vectors = self._vectors
+        return [np.array(vectors[row]) if row is not None else None for row in rows]
+
+
+class NumpyVectorStore(VectorStore):
+    """In-process backend: brute-force cosine top-k over memory-mapped float32 matrices.
+
+    Meant for small collections, tests and single-host deployments without a
+    Qdrant server. Several processes on the same host can share one directory.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._collections = {}
+
+    def _collection(self, collection_name: str):
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                collection = NumpyCollection(os.path.join(self.directory, quote(collection_name, safe="")))
+                self._collections[collection_name] = collection
+            return collection
+
+    def collection_info(self, collection_name: str):
+        collection = self._collection(collection_name)
+        if not collection.exists():
+            return None
+        try:
+            points_count = collection.count()
+        except CollectionNotFound:
+            return None
+        return {"vector_size": collection.dim, "points_count": points_count, "payload_indexes": {}}
+
+    def create_collection(self, collection_name: str, vector_size: int):
+        self._collection(collection_name).create(vector_size)
+
+    def upsert(self, collection_name: str, points: list):
+        collection = self._collection(collection_name)
+        if not collection.exists():
+            raise CollectionNotFound(collection_name)
+        collection.upsert(points)
+
+    def delete(self, collection_name: str, ids: list):
+        collection = self._collection(collection_name)
+        if collection.exists():
+            collection.delete(ids)
+
+    def count(self, collection_name: str):
+        collection = self._collection(collection_name)
+        if not collection.exists():
+            raise CollectionNotFound(collection_name)
+        return collection.count()
+
+    def search(self, collection_name: str, vector: list, limit: int, with_payload=True, query_filter: dict = None,
+               with_vectors: bool = False):
+        collection = self._collection(collection_name)
+        if not collection.exists():
+            raise CollectionNotFound(collection_name)
+        return collection.search(vector, limit, with_payload, query_filter, with_vectors)
+
+    def retrieve_vectors(self, collection_name: str, ids: list):
+        collection = self._collection(collection_name)
+        if not collection.exists():
+            raise CollectionNotFound(collection_name)
+        return collection.retrieve_vectors(ids)
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import re
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import (
+    PointStruct, VectorParams, Distance, HnswConfigDiff, SearchParams, QuantizationSearchParams, Filter,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, BinaryQuantization, BinaryQuantizationConfig
+)
+from app.services.HttpClientService import http_client_service
+from app.services.VectorStore import VectorStore, CollectionNotFound
+
+
+# Storage profiles for new collections. Quantized profiles keep the compact
+# vectors in RAM for the HNSW search, leave the float32 originals on disk, and
+# rescore an oversampled candidate set with the originals at query time.
+PROFILES = {
+    "float32": {"quantization": None, "on_disk": False, "oversampling": None},
+    "scalar": {"quantization": "scalar", "on_disk": True, "oversampling": 2.0},
+    "binary": {"quantization": "binary", "on_disk": True, "oversampling": 3.0},
+}
+
+
+VECTOR_RE = re.compile(rb'"vector"\s*:\s*\[')
+
+
+def _parse_vectors(content: bytes, ids: list):
+    """Parse a payload-free points response into float32 vectors ordered like `ids`.
+
+    json.loads would build a Python float per dimension while holding the GIL
+    (~2 ms per 4096-dim vector), stalling the event loop even from a worker
+    thread. numpy parses the number arrays instead, and the rest of the
+    response, with each array replaced by its row number, goes to json.
+    """
+    pieces = []
+    rows = []
+    pos = 0
+    for match in VECTOR_RE.finditer(content):
+        end = content.index(b"]", match.end())
+        rows.append(np.fromstring(content[match.end():end], dtype=np.float32, sep=","))
+        pieces += [content[pos:match.start()], b'"vector":%d' % (len(rows) - 1)]
+        pos = end + 1
+    pieces.append(content[pos:])
+    vectors = {}
+    for point in json.loads(b"".join(pieces)).get("result", []):
+        row = point.get("vector")
+        if isinstance(row, int):
+            vectors[point["id"]] = rows[row]
+    return [vectors.get(point_id) for point_id in ids]
+
+
+class QdrantVectorStore(VectorStore):
+    """Qdrant backend: qdrant-client for writes, the pooled async REST client for queries"""
+
+    def __init__(self, url: str, profile: str = "float32", hnsw_m: int = 16, hnsw_ef_construct: int = 100,
+                 oversampling: float = None, hnsw_ef: int = None):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown Qdrant collection profile '{profile}'")
+        self.url = url
+        self.profile = dict(PROFILES[profile])
+        if oversampling is not None:
+            self.profile["oversampling"] = oversampling
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.hnsw_ef = hnsw_ef
+        self._client = QdrantClient(url=url)
+
+    def _quantization_config(self):
+        if self.profile["quantization"] == "scalar":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True))
+        if self.profile["quantization"] == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def _search_params(self):
+        """Query-time search params as a REST dict, or None for Qdrant's defaults"""
+        params = {}
+        if self.hnsw_ef:
+            params["hnsw_ef"] = self.hnsw_ef
+        if self.profile["quantization"]:
+            params["quantization"] = {"rescore": True, "oversampling": self.profile["oversampling"] or 1.0}
+        return params or None
+
+    def _filter(self, query_filter: dict):
+        """Translate a SearchFilter dict into a Qdrant REST filter, or None"""
+        if not query_filter:
+            return None
+        must = []
+        if query_filter.get("source_ids") is not None:
+            must.append({"key": "source_id", "match": {"any": list(query_filter["source_ids"])}})
+        for field, expected in (query_filter.get("match") or {}).items():
+            must.append({"key": field, "match": {"any": expected} if isinstance(expected, list) else {"value": expected}})
+        for field, bounds in (query_filter.get("range") or {}).items():
+            must.append({"key": field, "range": bounds})
+        return {"must": must} if must else None
+
+    def collection_info(self, collection_name: str):
+        try:
+            info = self._client.get_collection(collection_name)
+        except Exception as e:
+            if "not found" in str(e).lower():
+                return None
+            raise
+        vectors = info.config.params.vectors
+        return {
+            "vector_size": getattr(vectors, "size", None),
+            "points_count": info.points_count,
+            "payload_indexes": {
+                field: getattr(schema.data_type, "value", schema.data_type)
+                for field, schema in (info.payload_schema or {}).items()
+            },
+        }
+
+    def create_collection(self, collection_name: str, vector_size: int):
+        self._client.recreate_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=self.profile["on_disk"]),
+            hnsw_config=HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct),
+            quantization_config=self._quantization_config()
+        )
+
+    def upsert(self, collection_name: str, points: list):
+        self._client.upsert(
+            collection_name=collection_name,
+            points=[PointStruct(id=p["id"], vector=p["vector"], payload=p["payload"]) for p in points]
+        )
+
+    def delete(self, collection_name: str, ids: list):
+        try:
+            self._client.delete(collection_name=collection_name, points_selector=list(ids))
+        except Exception as e:
+            # A missing collection has nothing left to delete
+            if "not found" not in str(e).lower():
+                raise
+
+    def count(self, collection_name: str):
+        return self._client.count(collection_name=collection_name, exact=True).count
+
+    def create_payload_index(self, collection_name: str, field: str, schema: str):
+        self._client.create_payload_index(collection_name=collection_name, field_name=field, field_schema=schema)
+
+    def search(self, collection_name: str, vector: list, limit: int, with_payload=True, query_filter: dict = None,
+               with_vectors: bool = False):
+        try:
+            params = self._search_params()
+            qdrant_filter = self._filter(query_filter)
+            hits = self._client.query_points(
+                collection_name=collection_name, query=vector, limit=limit, with_payload=with_payload,
+                with_vectors=with_vectors,
+                query_filter=Filter(**qdrant_filter) if qdrant_filter else None,
+                search_params=SearchParams(
+                    hnsw_ef=params.get("hnsw_ef"),
+                    quantization=QuantizationSearchParams(**params["quantization"]) if "quantization" in params else None
+                ) if params else None
+            ).points
+        except Exception as e:
+            if "not found" in str(e).lower():
+                raise CollectionNotFound(collection_name)
+            raise
+        if with_vectors:
+            return [{"id": hit.id, "score": hit.score, "payload": hit.payload, "vector": hit.vector} for hit in hits]
+        return [{"id": hit.id, "score": hit.score, "payload": hit.payload} for hit in hits]
+
+    def retrieve_vectors(self, collection_name: str, ids: list):
+        try:
+            points = self._client.retrieve(collection_name=collection_name, ids=ids, with_payload=False, with_vectors=True)
+        except Exception as e:
+            if "not found" in str(e).lower():
+                raise CollectionNotFound(collection_name)
+            raise
+        vectors = {point.id: point.vector for point in points}
+        return [vectors.get(point_id) for point_id in ids]
+
+    async def acollection_info(self, collection_name: str):
+        client = http_client_service.get_async_client(self.url)
+        resp = await client.get(f"/collections/{collection_name}", timeout=10.0)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        result = resp.json().get("result") or {}
+        vectors = result.get("config", {}).get("params", {}).get("vectors", {})
+        return {
+            "vector_size": vectors.get("size") if isinstance(vectors, dict) else None,
+            "points_count": result.get("points_count"),
+            "payload_indexes": {
+                field: schema.get("data_type") for field, schema in (result.get("payload_schema") or {}).items()
+            },
+        }
+
+    async def asearch(self, collection_name: str, vector: list, limit: int, with_payload=True, query_filter: dict = None,
+                      with_vectors: bool = False):
+        client = http_client_service.get_async_client(self.url)
+        body = {"vector": vector, "limit": limit, "with_payload": with_payload, "with_vector": with_vectors}
+        params = self._search_params()
+        if params:
+            body["params"] = params
+        qdrant_filter = self._filter(query_filter)
+        if qdrant_filter:
+            body["filter"] = qdrant_filter
+        resp = await client.post(f"/collections/{collection_name}/points/search", json=body, timeout=60.0)
+        if resp.status_code == 404:
+            raise CollectionNotFound(collection_name)
+        resp.raise_for_status()
+        return resp.json().get("result", [])
+
+    async def aretrieve_vectors(self, collection_name: str, ids: list):
+        client = http_client_service.get_async_client(self.url)
+        resp = await client.post(
+            f"/collections/{collection_name}/points",
+            json={"ids": ids, "with_payload": False, "with_vector": True}, timeout=60.0
+        )
+        if resp.status_code == 404:
+            raise CollectionNotFound(collection_name)
+        resp.raise_for_status()
+        return await asyncio.to_thread(_parse_vectors, resp.content, ids)
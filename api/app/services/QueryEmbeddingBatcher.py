@@ -0,0 +1,77 @@
+import asyncio
+from app.services.EmbeddingCache import cache_key
+
+
+class QueryEmbeddingBatcher:
+    """Coalesces concurrent query embeddings into batched requests.
+
+    Callers arriving within `max_wait` seconds of each other (up to `max_batch`
+    of them) share one call to `embed_texts`, and concurrent callers asking
+    for the same normalized text share a single in-flight embedding.
+    """
+
+    def __init__(self, embed_texts):
+        self._embed_texts = embed_texts
+        self.max_wait = 0.005
+        self.max_batch = 32
+        self._pending = {}
+        self._timers = {}
+        self._inflight = {}
+        # The loop only keeps weak references to tasks; hold batches until they finish
+        self._tasks = set()
+
+    def configure(self, max_wait_ms: float = 5.0, max_batch: int = 32):
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+        self.max_batch = max(1, max_batch)
+
+    async def embed(self, ollama_url: str, model: str, text: str):
+        """Embed one text as part of the next batch for this Ollama model"""
+        group = (ollama_url, model)
+        key = (group, cache_key(model, text))
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[key] = future
+            queue = self._pending.setdefault(group, [])
+            queue.append((key, text, future))
+            if len(queue) >= self.max_batch:
+                self._flush(group)
+            elif len(queue) == 1:
+                self._timers[group] = loop.call_later(self.max_wait, self._flush, group)
+        # Shield so one caller giving up doesn't cancel the batch for the others
+        return await asyncio.shield(future)
+
+    def _flush(self, group):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group, None)
+        if batch:
+            task = asyncio.ensure_future(self._run(group, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, group, batch):
+        ollama_url, model = group
+        try:
+            try:
+                embeddings = await self._embed_texts(ollama_url, model, [text for _, text, _ in batch])
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Don't let one rejected query fail everyone it was batched with
+                await asyncio.gather(*(self._run(group, [item]) for item in batch))
+                return
+            for (_, _, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so abandoned callers don't log "never retrieved"
+                    future.exception()
+        finally:
+            for key, _, _ in batch:
+                self._inflight.pop(key, None)
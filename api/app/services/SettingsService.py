@@ -25,6 +25,8 @@ class SettingsService:
                     setting = Settings(key=key, value=str(value) if value is not None else None)
                     db.add(setting)
             
+            # Tell other API and sync worker processes to reload their settings
+            content_service._bump_settings_version(db)
             db.commit()
             
             # Invalidate cache in ContentService so it reloads settings
@@ -0,0 +1,239 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.models.rfy_sync_job import RfySyncJob
+from app.services.ContentService import content_service
+
+
+ACTIVE_STATUSES = ("queued", "running")
+# A running job whose heartbeat is older than this is assumed to have died with its process
+STALE_JOB_AFTER = timedelta(minutes=5)
+# Minimum interval between progress writes to MySQL
+PROGRESS_INTERVAL = timedelta(seconds=1)
+# How often a running job's heartbeat is refreshed, independently of progress
+HEARTBEAT_INTERVAL = timedelta(seconds=30)
+
+
+class SyncJobService:
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._queue_size = 16
+
+    def start(self):
+        """Start the background executor and resume jobs left over by a previous process"""
+        db = SessionLocal()
+        try:
+            workers = int(content_service._get_setting(db, "sync_job_workers", "2"))
+            self._queue_size = int(content_service._get_setting(db, "sync_job_queue_size", "16"))
+        except Exception as e:
+            print(f"Warning: Failed to load sync job settings: {e}")
+            workers = 2
+        finally:
+            db.close()
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sync-job")
+        try:
+            self.recover_jobs()
+        except Exception as e:
+            print(f"Warning: Failed to recover sync jobs: {e}")
+
+    def shutdown(self):
+        """Stop accepting jobs; running jobs are resumed by the next process"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def recover_jobs(self):
+        """Requeue jobs that were queued, or whose worker stopped heartbeating"""
+        db = SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - STALE_JOB_AFTER
+            db.query(RfySyncJob).filter(
+                RfySyncJob.status == "running",
+                RfySyncJob.heartbeat_at < cutoff
+            ).update({"status": "queued"}, synchronize_session=False)
+            db.commit()
+            job_ids = [
+                job_id for (job_id,) in
+                db.query(RfySyncJob.id).filter(RfySyncJob.status == "queued").order_by(RfySyncJob.created_at)
+            ]
+        finally:
+            db.close()
+        for job_id in job_ids:
+            self._submit(job_id)
+
+    def _submit(self, job_id: str):
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._run, job_id)
+
+    def enqueue(self, db: Session, collection_name: str = None):
+        """Queue a sync job, reusing an active job for the same collection"""
+        if self._executor is None:
+            raise HTTPException(status_code=503, detail="Sync job executor is not running")
+        try:
+            job = db.query(RfySyncJob).filter(
+                RfySyncJob.collection_name.is_(None) if collection_name is None
+                else RfySyncJob.collection_name == collection_name,
+                RfySyncJob.status.in_(ACTIVE_STATUSES)
+            ).first()
+            if job and job.status == "running" and job.heartbeat_at < datetime.utcnow() - STALE_JOB_AFTER:
+                # Its worker died; take the job over instead of reporting it forever
+                requeued = db.query(RfySyncJob).filter(
+                    RfySyncJob.id == job.id,
+                    RfySyncJob.status == "running",
+                    RfySyncJob.heartbeat_at < datetime.utcnow() - STALE_JOB_AFTER
+                ).update({"status": "queued"}, synchronize_session=False)
+                db.commit()
+                db.refresh(job)
+                if requeued:
+                    self._submit(job.id)
+            if job:
+                return self._serialize(job)
+
+            with self._lock:
+                if self._pending >= self._queue_size:
+                    raise HTTPException(status_code=429, detail="Too many sync jobs queued, try again later")
+
+            job = RfySyncJob(
+                id=uuid.uuid4().hex,
+                collection_name=collection_name,
+                status="queued",
+                rows_total=0,
+                rows_done=0,
+                rows_failed=0,
+                created_at=datetime.utcnow()
+            )
+            db.add(job)
+            db.commit()
+            self._submit(job.id)
+            return self._serialize(job)
+        except HTTPException:
+            raise
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to queue sync job: {str(e)}")
+
+    def get_job(self, db: Session, job_id: str):
+        """Get a sync job with its progress, rate and ETA"""
+        job = db.query(RfySyncJob).filter(RfySyncJob.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Sync job not found")
+        return self._serialize(job)
+
+    def _serialize(self, job: RfySyncJob):
+        rate = None
+        eta_sec = None
+        if job.started_at:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                rate = round(job.rows_done / elapsed, 2)
+            remaining = max(0, job.rows_total - job.rows_done - job.rows_failed)
+            if job.status == "running" and rate:
+                eta_sec = round(remaining / rate, 1)
+        return {
+            "job_id": job.id,
+            "collection_name": job.collection_name,
+            "status": job.status,
+            "rows_total": job.rows_total,
+            "rows_done": job.rows_done,
+            "rows_failed": job.rows_failed,
+            "rows_per_sec": rate,
+            "eta_sec": eta_sec,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    def _run(self, job_id: str):
+        try:
+            self._run_job(job_id)
+        except Exception as e:
+            print(f"Sync job {job_id} crashed: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _heartbeat(self, job_id: str, stop: threading.Event):
+        """Refresh a running job's heartbeat until `stop` is set, even while one batch takes minutes"""
+        while not stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+            db = SessionLocal()
+            try:
+                db.query(RfySyncJob).filter(
+                    RfySyncJob.id == job_id,
+                    RfySyncJob.status == "running"
+                ).update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                print(f"Warning: Failed to refresh heartbeat of sync job {job_id}: {e}")
+            finally:
+                db.close()
+
+    def _run_job(self, job_id: str):
+        # Job bookkeeping gets its own session so progress commits never
+        # interleave with the sync's own transactions
+        job_db = SessionLocal()
+        db = SessionLocal()
+        try:
+            # Claim the job; another process may already have picked it up
+            now = datetime.utcnow()
+            claimed = job_db.query(RfySyncJob).filter(
+                RfySyncJob.id == job_id,
+                RfySyncJob.status == "queued"
+            ).update({"status": "running", "started_at": now, "heartbeat_at": now}, synchronize_session=False)
+            job_db.commit()
+            if not claimed:
+                return
+
+            job = job_db.query(RfySyncJob).filter(RfySyncJob.id == job_id).one()
+            stop_heartbeat = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=(job_id, stop_heartbeat),
+                name=f"sync-job-heartbeat-{job_id[:8]}", daemon=True
+            )
+            heartbeat.start()
+            try:
+                job.rows_total = content_service.count_pending_content(db, job.collection_name)
+                job_db.commit()
+
+                last_write = [datetime.utcnow()]
+
+                def progress(rows_done, rows_failed):
+                    now = datetime.utcnow()
+                    if now - last_write[0] < PROGRESS_INTERVAL:
+                        return
+                    last_write[0] = now
+                    job.rows_done = rows_done
+                    job.rows_failed = rows_failed
+                    job.heartbeat_at = now
+                    job_db.commit()
+
+                result = content_service.process_content(db, collection_name=job.collection_name, progress=progress)
+                job.rows_done = result.get("content_processed", 0) + result.get("content_unchanged", 0)
+                job.rows_failed = result.get("content_failed", 0)
+                job.result = result
+                job.status = "completed"
+            except Exception as e:
+                job_db.rollback()
+                job.status = "failed"
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+            finally:
+                stop_heartbeat.set()
+                heartbeat.join()
+            job.finished_at = datetime.utcnow()
+            job_db.commit()
+        finally:
+            db.close()
+            job_db.close()
+
+
+# Create a global instance of the service
+sync_job_service = SyncJobService()
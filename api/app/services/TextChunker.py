@@ -0,0 +1,60 @@
+import re
+
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class TextChunker:
+    """Splits long text into overlapping chunks by tokens or by sentences.
+
+    Tokens are whitespace-separated words, a cheap stand-in for the embedding
+    model's own tokenizer; `size` and `overlap` are counted in them either way.
+    """
+
+    def chunk(self, text: str, mode: str = "tokens", size: int = 256, overlap: int = 32):
+        size = max(1, size)
+        overlap = min(max(0, overlap), size - 1)
+        if mode == "sentences":
+            return self._by_sentences(text, size, overlap)
+        return self._by_tokens(text.split(), size, overlap)
+
+    def _by_tokens(self, words: list, size: int, overlap: int):
+        step = size - overlap
+        return [" ".join(words[i:i + size]) for i in range(0, max(len(words) - overlap, 1), step)]
+
+    def _by_sentences(self, text: str, size: int, overlap: int):
+        """Pack whole sentences up to `size` tokens, repeating trailing sentences up to `overlap`"""
+        chunks = []
+        current = []
+        current_len = 0
+        for sentence in SENTENCE_RE.split(text.strip()):
+            words = sentence.split()
+            if not words:
+                continue
+            if len(words) > size:
+                # A sentence that can't fit on its own is split by tokens
+                if current:
+                    chunks.append(" ".join(current))
+                chunks.extend(self._by_tokens(words, size, overlap))
+                current, current_len = [], 0
+                continue
+            if current and current_len + len(words) > size:
+                chunks.append(" ".join(current))
+                carried = []
+                carried_len = 0
+                for previous in reversed(current):
+                    previous_len = len(previous.split())
+                    if carried_len + previous_len > overlap or carried_len + previous_len + len(words) > size:
+                        break
+                    carried.insert(0, previous)
+                    carried_len += previous_len
+                current, current_len = carried, carried_len
+            current.append(sentence)
+            current_len += len(words)
+        if current:
+            chunks.append(" ".join(current))
+        return chunks or [""]
+
+
+# Create a global instance of the chunker
+text_chunker = TextChunker()
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TtlLruCache:
+    """Thread-safe in-process cache with a size bound (LRU) and per-entry expiry"""
+
+    def __init__(self, max_items: int = 1000, ttl: float = 300.0):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._max_items = max_items
+        self._ttl = ttl
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def configure(self, max_items: int = 1000, ttl: float = 300.0):
+        with self._lock:
+            self._max_items = max(0, max_items)
+            self._ttl = ttl
+            self._evict()
+
+    def get(self, key):
+        """Return the cached value for `key`, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self._max_items <= 0:
+                return
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self._max_items:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else None,
+                "items": len(self._entries),
+                "capacity": self._max_items,
+                "ttl_sec": self._ttl,
+            }
@@ -0,0 +1,93 @@
+import asyncio
+
+
+class CollectionNotFound(Exception):
+    """The collection does not exist in the vector store"""
+
+
+def _equals(value, expected):
+    # True == 1 in Python, but a bool shouldn't match a number the way it wouldn't in Qdrant
+    return value == expected and isinstance(value, bool) == isinstance(expected, bool)
+
+
+def matches_filter(payload: dict, query_filter: dict):
+    """Evaluate a search filter against one payload, for backends without native filtering"""
+    if not query_filter:
+        return True
+    source_ids = query_filter.get("source_ids")
+    if source_ids is not None and payload.get("source_id") not in source_ids:
+        return False
+    for field, expected in (query_filter.get("match") or {}).items():
+        # Like Qdrant, an array value matches when any of its elements does
+        values = payload.get(field)
+        values = values if isinstance(values, list) else [values]
+        expected = expected if isinstance(expected, list) else [expected]
+        if not any(_equals(value, e) for value in values for e in expected):
+            return False
+    for field, bounds in (query_filter.get("range") or {}).items():
+        value = payload.get(field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        if "gt" in bounds and not value > bounds["gt"]:
+            return False
+        if "gte" in bounds and not value >= bounds["gte"]:
+            return False
+        if "lt" in bounds and not value < bounds["lt"]:
+            return False
+        if "lte" in bounds and not value <= bounds["lte"]:
+            return False
+    return True
+
+
+class VectorStore:
+    """Interface of the backends that store and search content vectors.
+
+    Points are dicts with "id", "vector" and "payload"; search hits are dicts
+    with "id", "score" and "payload", best first. Scores are cosine similarities.
+    `with_payload` is True for whole payloads or a list of the fields to return.
+    `query_filter` is a SearchFilter dict ("source_ids", "match", "range")
+    whose conditions must all hold. With `with_vectors` hits also carry their
+    stored "vector".
+    The async methods default to running the sync ones in a worker thread;
+    backends with a native async client override them.
+    """
+
+    def collection_info(self, collection_name: str):
+        """Return {"vector_size", "points_count", "payload_indexes"} for a collection, or None if it doesn't exist"""
+        raise NotImplementedError
+
+    def create_collection(self, collection_name: str, vector_size: int):
+        """Create an empty collection, replacing any existing one of that name"""
+        raise NotImplementedError
+
+    def upsert(self, collection_name: str, points: list):
+        raise NotImplementedError
+
+    def delete(self, collection_name: str, ids: list):
+        """Delete points by id; deleting from a missing collection is a no-op"""
+        raise NotImplementedError
+
+    def count(self, collection_name: str):
+        raise NotImplementedError
+
+    def create_payload_index(self, collection_name: str, field: str, schema: str):
+        """Index a payload field ("keyword", "integer", "float", "bool"); backends that filter by scanning ignore it"""
+
+    def search(self, collection_name: str, vector: list, limit: int, with_payload=True, query_filter: dict = None,
+               with_vectors: bool = False):
+        """Return the `limit` nearest points, raising CollectionNotFound if needed"""
+        raise NotImplementedError
+
+    def retrieve_vectors(self, collection_name: str, ids: list):
+        """Return the stored vectors of points by id, in order, None for missing points"""
+        raise NotImplementedError
+
+    async def acollection_info(self, collection_name: str):
+        return await asyncio.to_thread(self.collection_info, collection_name)
+
+    async def asearch(self, collection_name: str, vector: list, limit: int, with_payload=True, query_filter: dict = None,
+                      with_vectors: bool = False):
+        return await asyncio.to_thread(self.search, collection_name, vector, limit, with_payload, query_filter, with_vectors)
+
+    async def aretrieve_vectors(self, collection_name: str, ids: list):
+        return await asyncio.to_thread(self.retrieve_vectors, collection_name, ids)
@@ -0,0 +1,83 @@
+"""Standalone sync worker.
+
+Run any number of replicas with `python -m app.worker`; each one leases
+disjoint chunks of rfy_content_buffer, embeds them and upserts them to Qdrant.
+"""
+import argparse
+import os
+import signal
+import time
+from fastapi import HTTPException
+from app.db.session import SessionLocal
+from app.services.ContentService import content_service
+
+
+class SyncWorker:
+    def __init__(self, collection_name: str = None, poll_interval: float = 5.0):
+        self.collection_name = collection_name
+        self.poll_interval = poll_interval
+        self.worker_id = content_service.new_worker_id()
+        self._stopping = False
+
+    def stop(self, *args):
+        """Finish the current pass, then exit"""
+        self._stopping = True
+
+    def run_once(self):
+        """Run one sync pass and return its result"""
+        db = SessionLocal()
+        try:
+            return content_service.process_content(
+                db, collection_name=self.collection_name, worker_id=self.worker_id
+            )
+        finally:
+            db.close()
+
+    def run(self):
+        print(f"Sync worker {self.worker_id} started")
+        while not self._stopping:
+            try:
+                result = self.run_once()
+            except HTTPException as e:
+                print(f"Sync pass failed: {e.detail}")
+                result = None
+            except Exception as e:
+                print(f"Sync pass failed: {e}")
+                result = None
+
+            if result and (result["content_processed"] or result["content_unchanged"] or result["content_deleted"]):
+                print(
+                    f"Synced {result['content_processed']} rows "
+                    f"({result['content_failed']} failed, {result['content_deleted']} deleted) "
+                    f"at {result['rows_per_sec']} rows/sec"
+                )
+                # There may be more work waiting; go straight back for it
+                continue
+
+            # Idle or failing: back off before polling again
+            deadline = time.monotonic() + self.poll_interval
+            while not self._stopping and time.monotonic() < deadline:
+                time.sleep(0.2)
+        print(f"Sync worker {self.worker_id} stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync rfy_content_buffer to Qdrant")
+    parser.add_argument("--collection", default=None, help="Only sync this collection")
+    parser.add_argument("--poll-interval", type=float, default=float(os.getenv("SYNC_WORKER_POLL_INTERVAL", "5")),
+                        help="Seconds to wait between passes when there is no work")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args()
+
+    worker = SyncWorker(collection_name=args.collection, poll_interval=args.poll_interval)
+    if args.once:
+        print(worker.run_once())
+        return
+
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
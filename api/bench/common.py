@@ -0,0 +1,73 @@
+import time
+
+import httpx
+import numpy as np
+
+
+def vector_batches(count: int, dim: int, batch_size: int = 1000, seed: int = 0):
+    """Yield (first_id, float32 batch) of random unit vectors, `batch_size` at a time"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, count, batch_size):
+        batch = rng.standard_normal((min(batch_size, count - start), dim), dtype=np.float32)
+        batch /= np.linalg.norm(batch, axis=1, keepdims=True)
+        yield start, batch
+
+
+def query_vectors(count: int, dim: int, queries: int, noise: float = 0.3, seed: int = 0):
+    """Queries that are noisy copies of stored vectors, so they have real near neighbours"""
+    rng = np.random.default_rng(seed + 1)
+    targets = set(rng.choice(count, size=min(queries, count), replace=False).tolist())
+    picked = []
+    for start, batch in vector_batches(count, dim, seed=seed):
+        for row in range(len(batch)):
+            if start + row in targets:
+                picked.append(batch[row])
+    picked = np.stack(picked)
+    picked += rng.standard_normal(picked.shape, dtype=np.float32) * (noise / np.sqrt(dim))
+    return picked / np.linalg.norm(picked, axis=1, keepdims=True)
+
+
+def load_collection(store, collection_name: str, count: int, dim: int, batch_size: int = 1000, seed: int = 0):
+    """Create a collection of `count` random points and return the seconds it took"""
+    started = time.perf_counter()
+    store.create_collection(collection_name, dim)
+    for start, batch in vector_batches(count, dim, batch_size, seed):
+        store.upsert(collection_name, [
+            {"id": start + row + 1, "vector": vector.tolist(), "payload": {"source_id": f"s{start + row}"}}
+            for row, vector in enumerate(batch)
+        ])
+    return time.perf_counter() - started
+
+
+async def timed_searches(store, collection_name: str, queries, limit: int, warmup: int = 5):
+    """Run the queries one at a time through the async search the API uses; return (latencies_ms, hit ids).
+
+    The first `warmup` queries also run untimed first, to open connections and warm caches.
+    """
+    for query in queries[:warmup]:
+        await store.asearch(collection_name, query.tolist(), limit, with_payload=[])
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = await store.asearch(collection_name, query.tolist(), limit, with_payload=[])
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append([hit["id"] for hit in hits])
+    return latencies, results
+
+
+def percentiles(latencies: list):
+    values = np.asarray(latencies)
+    return {f"p{p}": round(float(np.percentile(values, p)), 2) for p in (50, 95, 99)}
+
+
+def recall(expected: list, found: list):
+    """Mean recall@k of `found` against the exact `expected` neighbours"""
+    return float(np.mean([len(set(e) & set(f)) / len(e) for e, f in zip(expected, found) if e]))
+
+
+def qdrant_available(url: str):
+    try:
+        return httpx.get(f"{url}/collections", timeout=2.0).status_code == 200
+    except httpx.HTTPError:
+        return False
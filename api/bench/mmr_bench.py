@@ -0,0 +1,95 @@
+"""Cost of MMR re-ranking at the default sizes, split into its parts.
+
+Run from api/:
+
+    python -m bench.mmr_bench --dim 4096 --fetch-k 20 --limit 5
+
+MMR needs the candidates' vectors, which Qdrant's REST API returns as JSON
+number lists. For a synthetic points response of that shape this times parsing
+it with json.loads and with the store's `_parse_vectors`, and how long each
+stalls the event loop when run in a worker thread: json.loads holds the GIL
+while it builds a Python float per dimension, so a thread does not help it.
+Then it times the greedy MMR selection on the float32 matrix. It runs at
+fetch_k candidates and at fetch_k * chunk_search_overfetch.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from app.services.MmrReranker import mmr_reranker
+from app.services.QdrantVectorStore import _parse_vectors
+
+
+def per_call_ms(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def points_response(candidates: int, dim: int, rng):
+    """A Qdrant /points response body for a payload-free retrieve"""
+    result = [
+        {"id": i + 1, "payload": None, "vector": rng.standard_normal(dim, dtype=np.float32).tolist()}
+        for i in range(candidates)
+    ]
+    return json.dumps({"result": result, "status": "ok", "time": 0.001}, separators=(",", ":")).encode()
+
+
+async def loop_stall_ms(fn, repeat: int):
+    """Longest gap a 1 ms ticker sees while `fn` runs in a worker thread"""
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticking = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(repeat):
+        await asyncio.to_thread(fn)
+    ticking.cancel()
+    return max(gaps) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dim", type=int, default=4096, help="the default vector_size")
+    parser.add_argument("--fetch-k", type=int, default=20, help="MmrOptions.fetch_k default")
+    parser.add_argument("--overfetch", type=int, default=4, help="chunk_search_overfetch default")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dim).tolist()
+    print(f"dim={args.dim} limit={args.limit}, milliseconds per search")
+    print(
+        f"{'candidates':>10} {'json.loads':>11} {'json stall':>11}"
+        f" {'_parse_vectors':>15} {'parse stall':>12} {'MMR select':>11}"
+    )
+    for candidates in (args.fetch_k, args.fetch_k * args.overfetch):
+        body = points_response(candidates, args.dim, rng)
+        ids = list(range(1, candidates + 1))
+        matrix = np.stack(_parse_vectors(body, ids))
+
+        decode = per_call_ms(lambda: json.loads(body), args.repeat)
+        json_stall = asyncio.run(loop_stall_ms(lambda: json.loads(body), args.repeat))
+        parse = per_call_ms(lambda: _parse_vectors(body, ids), args.repeat)
+        parse_stall = asyncio.run(loop_stall_ms(lambda: _parse_vectors(body, ids), args.repeat))
+        select = per_call_ms(lambda: mmr_reranker.select(query, matrix, args.limit), args.repeat * 10)
+        print(
+            f"{candidates:>10} {decode:>11.2f} {json_stall:>11.2f}"
+            f" {parse:>15.2f} {parse_stall:>12.2f} {select:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
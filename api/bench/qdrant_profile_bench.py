@@ -0,0 +1,101 @@
+"""Memory use, recall@k and latency of the Qdrant collection profiles (float32, scalar, binary).
+
+Run from api/ against a Qdrant server:
+
+    python -m bench.qdrant_profile_bench --size 100000 --dim 768 --qdrant-url http://localhost:6333
+
+The same random unit vectors go into one collection per profile. Recall@k is
+measured against exact brute-force neighbours from the NumPy backend. "vector
+RAM" is what the profile keeps in memory for the vectors themselves: float32 is
+dim * 4 bytes per point, scalar 1 byte per dimension and binary 1 bit, with
+quantized profiles' originals left on disk. "RSS delta" is the change in
+Qdrant's resident memory, from its /metrics endpoint, while the collection was
+loaded and indexed; it also includes the HNSW graph and payloads, and is empty
+if the server does not report it.
+"""
+import argparse
+import asyncio
+import re
+import tempfile
+import time
+
+import httpx
+
+from app.services.NumpyVectorStore import NumpyVectorStore
+from app.services.QdrantVectorStore import PROFILES, QdrantVectorStore
+from bench.common import load_collection, percentiles, qdrant_available, query_vectors, recall, timed_searches
+
+
+VECTOR_BYTES_PER_DIM = {None: 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+def resident_bytes(url: str):
+    """Qdrant's resident memory from /metrics, or None if it doesn't export it"""
+    try:
+        metrics = httpx.get(f"{url}/metrics", timeout=5.0).text
+    except httpx.HTTPError:
+        return None
+    match = re.search(r"^memory_resident_bytes\s+(\d+(?:\.\d+)?)", metrics, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+def wait_until_indexed(url: str, collection_name: str, timeout: float = 600.0):
+    """Wait for Qdrant to finish optimizing the collection, so searches use the HNSW index"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = httpx.get(f"{url}/collections/{collection_name}", timeout=10.0).json()["result"]["status"]
+        if status == "green":
+            return
+        time.sleep(1.0)
+    print(f"Warning: '{collection_name}' is still optimizing, results may not reflect the index")
+
+
+async def run(args):
+    queries = query_vectors(args.size, args.dim, args.queries)
+    exact_store = NumpyVectorStore(tempfile.mkdtemp(prefix="ragtify-bench-"))
+    load_collection(exact_store, "exact", args.size, args.dim)
+    _, exact = await timed_searches(exact_store, "exact", queries, args.limit, warmup=0)
+    exact_store.create_collection("exact", 1)
+
+    print(
+        f"{'profile':8} {'load s':>8} {'vector RAM MB':>14} {'RSS delta MB':>13}"
+        f" {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(args.limit):>10}"
+    )
+    for profile in args.profiles.split(","):
+        store = QdrantVectorStore(args.qdrant_url, profile=profile, hnsw_ef=args.hnsw_ef)
+        collection_name = f"bench_profile_{profile}"
+        rss_before = resident_bytes(args.qdrant_url)
+        started = time.perf_counter()
+        load_collection(store, collection_name, args.size, args.dim)
+        wait_until_indexed(args.qdrant_url, collection_name)
+        load_s = time.perf_counter() - started
+        rss_after = resident_bytes(args.qdrant_url)
+        latencies, results = await timed_searches(store, collection_name, queries, args.limit)
+        stats = percentiles(latencies)
+        vector_mb = args.size * args.dim * VECTOR_BYTES_PER_DIM[PROFILES[profile]["quantization"]] / 2 ** 20
+        rss_mb = f"{(rss_after - rss_before) / 2 ** 20:.0f}" if rss_before is not None and rss_after is not None else "-"
+        print(
+            f"{profile:8} {load_s:>8.1f} {vector_mb:>14.0f} {rss_mb:>13}"
+            f" {stats['p50']:>8} {stats['p95']:>8} {recall(exact, results):>10.3f}"
+        )
+        store._client.delete_collection(collection_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--hnsw-ef", type=int, default=None, help="query-time hnsw_ef, Qdrant's default if unset")
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    args = parser.parse_args()
+    if not qdrant_available(args.qdrant_url):
+        parser.error(f"Qdrant is not reachable at {args.qdrant_url}")
+    # One event loop for the whole run, since the pooled async clients are bound to it
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Search latency of the NumPy and Qdrant vector store backends at growing collection sizes.
+
+Run from api/:
+
+    python -m bench.vector_store_bench --sizes 10000,100000,1000000 --dim 768 \\
+        --qdrant-url http://localhost:6333
+
+Each size is loaded into both backends with the same random unit vectors, then
+searched one query at a time through `asearch`, the path the API uses. NumPy
+search is exact, so its results also give Qdrant's recall@k. Qdrant is skipped
+if it cannot be reached. The NumPy matrix takes size * dim * 4 bytes on disk
+and in the page cache: 1M points at the default vector_size of 4096 need 16 GB,
+so pick --dim to fit the host.
+"""
+import argparse
+import asyncio
+import tempfile
+
+from app.services.NumpyVectorStore import NumpyVectorStore
+from app.services.QdrantVectorStore import QdrantVectorStore
+from bench.common import load_collection, percentiles, qdrant_available, query_vectors, recall, timed_searches
+
+
+async def run(args):
+    stores = {"numpy": NumpyVectorStore(tempfile.mkdtemp(prefix="ragtify-bench-"))}
+    if qdrant_available(args.qdrant_url):
+        stores["qdrant"] = QdrantVectorStore(args.qdrant_url, profile=args.qdrant_profile)
+    else:
+        print(f"Qdrant is not reachable at {args.qdrant_url}, benchmarking NumPy only")
+
+    print(f"{'backend':8} {'size':>9} {'load s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'recall':>7}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        queries = query_vectors(size, args.dim, args.queries)
+        collection_name = f"bench_vector_store_{size}"
+        exact = None
+        for backend, store in stores.items():
+            load_s = load_collection(store, collection_name, size, args.dim)
+            latencies, results = await timed_searches(store, collection_name, queries, args.limit)
+            if backend == "numpy":
+                exact = results
+            stats = percentiles(latencies)
+            print(
+                f"{backend:8} {size:>9} {load_s:>8.1f} {stats['p50']:>8} {stats['p95']:>8} {stats['p99']:>8}"
+                f" {recall(exact, results):>7.3f}"
+            )
+            if backend == "qdrant":
+                store._client.delete_collection(collection_name)
+            else:
+                # Recreating empties it and frees the disk space
+                store.create_collection(collection_name, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated collection sizes")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--qdrant-profile", default="float32", help="float32, scalar or binary")
+    args = parser.parse_args()
+    # One event loop for the whole run, since the pooled async clients are bound to it
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+import app.services.ContentService as content_service_module
+from app.db.base import Base
+from app.models import Settings, SettingsVersion
+from app.services.ContentService import content_service
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    """An in-memory database shared by every session, with the NumPy vector store under tmp_path"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(content_service_module, "SessionLocal", session_factory)
+
+    session = session_factory()
+    session.add(SettingsVersion(id=1, version=1))
+    for key, value in {
+        "ollama_url": "http://ollama.test",
+        "vector_store_backend": "numpy",
+        "vector_store_path": str(tmp_path),
+        "vector_size": "3",
+        "embedding_cache_enabled": "false",
+        "search_cache_enabled": "false",
+        "answer_cache_enabled": "false",
+    }.items():
+        session.add(Settings(key=key, value=value))
+    session.commit()
+    content_service._invalidate_settings_cache()
+    yield session
+    session.close()
+    content_service._invalidate_settings_cache()
+    engine.dispose()
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.schemas.content import ChatRequest
+from app.services.ContentService import content_service
+from app.services.EmbeddingCache import embedding_cache
+from app.services.HttpClientService import http_client_service
+
+
+GENERATE_DELAY = 0.5
+EMBED_DELAY = 0.1
+CONCURRENT_CHATS = 8
+
+
+def slow_ollama():
+    """A fake Ollama whose /api/embed and /api/generate take a while, like a loaded GPU"""
+    calls = {"embed": 0, "generate": 0}
+
+    async def handler(request: httpx.Request):
+        body = json.loads(request.content)
+        if request.url.path == "/api/embed":
+            calls["embed"] += 1
+            await asyncio.sleep(EMBED_DELAY)
+            return httpx.Response(200, json={"embeddings": [[1.0, 0.1, 0.0] for _ in body["input"]]})
+        calls["generate"] += 1
+        await asyncio.sleep(GENERATE_DELAY)
+        lines = [{"response": "a mat", "done": False}, {"response": "", "done": True}]
+        return httpx.Response(200, content="".join(json.dumps(line) + "\n" for line in lines).encode())
+
+    return handler, calls
+
+
+def seed_collection(db):
+    store = content_service._get_vector_store(db)
+    store.create_collection("products", 3)
+    store.upsert("products", [
+        {"id": 1, "vector": [1.0, 0.1, 0.0], "payload": {"title": "blue mat", "url": "/mats/blue"}},
+        {"id": 2, "vector": [0.6, 0.0, 0.8], "payload": {"title": "yoga block", "url": "/blocks/1"}},
+    ])
+
+
+async def run_chats(db, monkeypatch):
+    handler, calls = slow_ollama()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://ollama.test")
+    monkeypatch.setattr(http_client_service, "get_async_client", lambda base_url: client)
+
+    # A ticker that notices whenever something holds the event loop
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def chat(i):
+        response = await content_service.chat(
+            ChatRequest(model="llama", prompt=f"which mat {i}?", collection_name="products"), db
+        )
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    ticking = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    bodies = await asyncio.gather(*(chat(i) for i in range(CONCURRENT_CHATS)))
+    elapsed = time.perf_counter() - started
+    ticking.cancel()
+    await client.aclose()
+    return bodies, elapsed, max(gaps), calls
+
+
+def test_concurrent_chats_overlap_on_slow_ollama(db, monkeypatch):
+    seed_collection(db)
+    bodies, elapsed, max_gap, calls = asyncio.run(run_chats(db, monkeypatch))
+
+    assert calls["generate"] == CONCURRENT_CHATS
+    for body in bodies:
+        assert [json.loads(line)["response"] for line in body.splitlines()] == ["a mat", ""]
+    # Serialized chats would take CONCURRENT_CHATS * (GENERATE_DELAY + EMBED_DELAY)
+    assert elapsed < 2 * (GENERATE_DELAY + EMBED_DELAY)
+    # Query embeddings are batched rather than sent one request per chat
+    assert calls["embed"] < CONCURRENT_CHATS
+    # Nothing on the request path blocks the loop while Ollama is slow
+    assert max_gap < 0.25
+
+
+def test_slow_embedding_cache_lookup_does_not_block_the_loop(db, monkeypatch):
+    seed_collection(db)
+
+    def slow_get_many(model, texts):
+        # A disk tier waiting on its file lock
+        time.sleep(0.3)
+        return [None] * len(texts)
+
+    monkeypatch.setattr(embedding_cache, "get_many", slow_get_many)
+    _, _, max_gap, _ = asyncio.run(run_chats(db, monkeypatch))
+
+    assert max_gap < 0.25
+
+
+def test_chat_grounds_prompt_in_search_results(db, monkeypatch):
+    seed_collection(db)
+    prompts = []
+    handler, _ = slow_ollama()
+
+    async def recording_handler(request: httpx.Request):
+        if request.url.path == "/api/generate":
+            prompts.append(json.loads(request.content)["prompt"])
+        return await handler(request)
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(recording_handler), base_url="http://ollama.test")
+        monkeypatch.setattr(http_client_service, "get_async_client", lambda base_url: client)
+        response = await content_service.chat(ChatRequest(model="llama", prompt="which mat?", collection_name="products"), db)
+        [chunk async for chunk in response.body_iterator]
+        await client.aclose()
+        return response
+
+    response = asyncio.run(main())
+    assert "blue mat" in prompts[0]
+    assert response.headers["x-context-items"] == "2"
@@ -107,9 +107,17 @@ function App() {
   const loadPayloads = async () => {
     setPayloadsLoading(true);
     try {
-      const res = await fetch(`${API_BASE}/content/`);
-      const data = await res.json().catch(() => []);
-      setPayloads(Array.isArray(data) ? data : []);
+      // Content is served in keyset pages; follow the cursor until the last page
+      const items = [];
+      let afterId = null;
+      do {
+        const query = afterId === null ? '' : `&after_id=${afterId}`;
+        const res = await fetch(`${API_BASE}/content/?limit=1000${query}`);
+        const data = await res.json().catch(() => []);
+        if (Array.isArray(data)) items.push(...data);
+        afterId = res.headers.get('X-Next-After-Id');
+      } while (afterId);
+      setPayloads(items);
     } catch (error) {
       console.error('Failed to load payloads:', error);
       alert('Failed to load payloads');
@@ -128,8 +136,16 @@ function App() {
         },
       });
       if (!res.ok) throw new Error('Failed to sync to Qdrant');
-      const data = await res.json();
-      alert(`Sync successful! Processed ${data.content_processed || 0} items.`);
+      let job = await res.json();
+      // Sync runs as a background job; poll until it finishes
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const jobRes = await fetch(`${API_BASE}/content/process/${job.job_id}`);
+        if (!jobRes.ok) throw new Error('Failed to get sync job status');
+        job = await jobRes.json();
+      }
+      if (job.status !== 'completed') throw new Error(job.error || 'Sync job failed');
+      alert(`Sync successful! Processed ${job.result?.content_processed || 0} items.`);
       loadPayloads();
     } catch (error) {
       console.error('Failed to sync to Qdrant:', error);